@@ -1,30 +1,388 @@
 # aiagent/agent.py
 import pandas as pd
-import re
-from collections import Counter
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 import numpy as np
+import os
+import re
+import pickle
+import hashlib
+import tempfile
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, repeat
 from datetime import datetime
-import matplotlib.pyplot as plt
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import KMeans
 import sys  # Import sys to handle command-line arguments
+from cache import ReportCache
+from dedup import NearDuplicateDetector
+from keywords import KeywordMatcher
+from phrases import PhraseCounter
+from schema import coerce_tweets, epoch_seconds, tweet_dates
+from sketches import ApproximateCounter, TokenAuthorSketch
+from topics import TopicClusterer, TopicModelCache
+from trends import DEFAULT_WINDOWS, PERIOD_FREQUENCIES, BurstDetector, PeriodCounter, TrendEngine
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('corpora/stopwords')
-    nltk.download('punkt_tab')
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('stopwords')
-    nltk.download('punkt_tab')
+# Pre-cached NLTK data next to this file, checked before NLTK's default locations
+NLTK_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nltk_data')
 
-class CelebrityCryptoAnalyzer:
+# NLTK data each tokenizer backend needs
+NLTK_RESOURCES = {
+    'regex': ['corpora/stopwords'],
+    'nltk': ['corpora/stopwords', 'tokenizers/punkt_tab']
+}
+
+# Resources already found in this process, so workers check the disk only once
+found_nltk_resources = set()
+
+def ensure_nltk_data(resources):
+    """Check that NLTK data is installed, without ever reaching for the network"""
+    missing = [resource for resource in resources if resource not in found_nltk_resources]
+    if not missing:
+        return
+    
+    # NLTK drags in scipy on import, so it is only loaded once an analyzer needs it
+    import nltk
+    if NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.insert(0, NLTK_DATA_DIR)
+    
+    for resource in missing:
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            raise LookupError(
+                f"NLTK resource '{resource}' is not installed. Run "
+                f"`python -c \"import agent; agent.download_nltk_data()\"` once to cache it in "
+                f"{NLTK_DATA_DIR}, or point NLTK_DATA at an existing copy."
+            ) from None
+        found_nltk_resources.add(resource)
+
+def download_nltk_data(download_dir=NLTK_DATA_DIR):
+    """Fetch the NLTK data the analyzer uses; meant for deploy time, not worker startup"""
+    import nltk
+    for package in ('stopwords', 'punkt_tab'):
+        nltk.download(package, download_dir=download_dir, raise_on_error=True)
+
+# Per-celebrity incremental report state; bump the version when ReportAccumulator changes
+TREND_STATE_DIR = 'trend_state'
+TREND_STATE_VERSION = 15
+
+# Incremental reports for the same celebrity take turns reading, updating and writing its state
+state_locks = {}
+
+# Fitted topic models reused across reports on the same tweet file
+MODEL_CACHE_DIR = 'model_cache'
+
+# Finished reports and trending words shared by every analyzer in the process, so
+# repeat views of the same data skip the pipeline
+REPORT_CACHE = ReportCache(max_entries=128, ttl_seconds=600)
+
+# Columns the report reads from columnar (Parquet/Feather) tweet files
+REPORT_COLUMNS = ['Username', 'Text', 'Created At', 'Retweets', 'Likes']
+
+# URLs, mentions and anything that is neither a word character nor whitespace, removed
+# in one pass. A mention stops where a URL starts, as it does when URLs are removed first.
+CLEAN_PATTERN = re.compile(r'https?://\S+|@(?:(?!https?://\S)\w)+|[^\w\s]')
+
+# Words NLTK's treebank tokenizer splits in two even without punctuation
+TREEBANK_SPLITS = {
+    'cannot': ('can', 'not'), 'gimme': ('gim', 'me'), 'gonna': ('gon', 'na'),
+    'gotta': ('got', 'ta'), 'lemme': ('lem', 'me'), 'wanna': ('wan', 'na')
+}
+
+def regex_tokenize(text):
+    """Clean and split lowercased tweet text with a single precompiled regex pass"""
+    tokens = CLEAN_PATTERN.sub('', text).split()
+    
+    if TREEBANK_SPLITS.keys().isdisjoint(tokens):
+        return tokens
+    return [part for token in tokens for part in TREEBANK_SPLITS.get(token, (token,))]
+
+def nltk_tokenize(text):
+    """Clean lowercased tweet text pass by pass and split it with NLTK's word_tokenize"""
+    # Remove URLs
+    text = re.sub(r'https?://\S+', '', text)
+    
+    # Remove mentions
+    text = re.sub(r'@\w+', '', text)
+    
+    # Remove hashtag symbol but keep the text
+    text = re.sub(r'#(\w+)', r'\1', text)
+    
+    # Remove punctuation and special characters
+    text = re.sub(r'[^\w\s]', '', text)
+    
+    from nltk.tokenize import word_tokenize
+    return word_tokenize(text)
+
+# Tokenizer backends; 'nltk' is the reference the fast 'regex' backend matches
+TOKENIZERS = {'regex': regex_tokenize, 'nltk': nltk_tokenize}
+
+def preprocess(text, stop_words, tokenizer='regex'):
+    """Lowercase and tokenize a tweet, dropping stopwords and words of two letters or less"""
+    tokens = TOKENIZERS[tokenizer](text.lower())
+    return [word for word in tokens if word not in stop_words and len(word) > 2]
+
+def count_words(texts, stop_words, tokenizer='regex'):
+    """Tokenize a shard of tweet texts and count its words; runs in the process pool"""
+    return Counter(chain.from_iterable(preprocess(text, stop_words, tokenizer)
+                                       for text in texts if isinstance(text, str)))
+
+def top_ids(scores, candidates, top_n):
+    """
+    The top N candidate ids by score, highest first with ties going to the lowest id
+    (the word seen first), without sorting every candidate
+    """
+    if top_n <= 0:
+        return candidates[:0]
+    
+    # Partial selection, keeping every candidate tied with the N-th score
+    if len(candidates) > top_n:
+        cutoff = -np.partition(-scores[candidates], top_n - 1)[top_n - 1]
+        candidates = candidates[scores[candidates] >= cutoff]
+    
+    return candidates[np.lexsort((candidates, -scores[candidates]))[:top_n]]
+
+class Vocabulary:
+    """Token to integer id mapping, with ids in first-seen order and counts in a NumPy array"""
+    
     def __init__(self):
+        self.ids = {}
+        self.words = []
+        self._counts = np.zeros(1024, dtype=np.int64)
+        self._lengths = np.zeros(1024, dtype=np.int64)
+        
+        # Distinct authors per word, only kept when authors are passed to add_tokens
+        self.authors = None
+    
+    def __len__(self):
+        return len(self.words)
+    
+    @property
+    def counts(self):
+        return self._counts[:len(self.words)]
+    
+    @property
+    def lengths(self):
+        return self._lengths[:len(self.words)]
+    
+    def add_tokens(self, token_lists, authors=None, weights=None):
+        """
+        Count every token in an iterable of token lists, optionally with each list's author.
+        Weights scale each list's counts; weighted totals are rounded to whole mentions.
+        Returns the word id of every token, in order.
+        """
+        token_lists = list(token_lists)
+        tokens = np.array(list(chain.from_iterable(token_lists)), dtype=object)
+        codes, uniques = pd.factorize(tokens)
+        lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+        
+        if weights is None:
+            counts = np.bincount(codes, minlength=len(uniques))
+        else:
+            weights = np.repeat(np.asarray(weights, dtype=np.float64), lengths)
+            counts = np.rint(np.bincount(codes, weights=weights, minlength=len(uniques))).astype(np.int64)
+        word_ids = self.add_counts(uniques, counts)
+        
+        if authors is not None:
+            if self.authors is None:
+                self.authors = TokenAuthorSketch()
+            self.authors.add(tokens, np.repeat(np.asarray(authors, dtype=object), lengths))
+        
+        return word_ids[codes]
+    
+    def add_counts(self, words, counts):
+        """Add counts for words, giving unseen words the next ids in the order given; returns their ids"""
+        ids = self.ids
+        first_new = len(self.words)
+        
+        # Words are collected as they get ids, so only the batch is scanned, never the vocabulary
+        new_words = []
+        word_ids = np.empty(len(words), dtype=np.int64)
+        for i, word in enumerate(words):
+            word_id = ids.get(word)
+            if word_id is None:
+                word_id = ids[word] = len(ids)
+                new_words.append(word)
+            word_ids[i] = word_id
+        
+        if new_words:
+            self._grow(len(ids))
+            self.words.extend(new_words)
+            self._lengths[first_new:len(ids)] = [len(word) for word in new_words]
+        
+        self._counts[word_ids] += counts
+        return word_ids
+    
+    def _grow(self, size):
+        if size <= len(self._counts):
+            return
+        capacity = max(size, 2 * len(self._counts))
+        self._counts = np.concatenate([self._counts, np.zeros(capacity - len(self._counts), dtype=np.int64)])
+        self._lengths = np.concatenate([self._lengths, np.zeros(capacity - len(self._lengths), dtype=np.int64)])
+
+class ReportAccumulator:
+    """Collects everything the memecoin trends report needs in one pass over the tweets"""
+    
+    def __init__(self, keyword_matcher, cluster_topics=True, granularity='month', trends=None):
+        self.keyword_matcher = keyword_matcher
+        
+        # Word frequencies over every tweet seen so far
+        self.vocabulary = Vocabulary()
+        
+        # Hashed bigram and trigram counts for collocations
+        self.phrases = PhraseCounter()
+        
+        # Mini-batch k-means over hashed tweet vectors, grouping tweets into narratives.
+        # Without cluster_topics the caller supplies a fitted clusterer instead.
+        self.topics = TopicClusterer() if cluster_topics else None
+        
+        # Crypto keyword and phrase frequencies per calendar period
+        self.period_counts = PeriodCounter(granularity)
+        
+        # Engagement-weighted score of every vocabulary word, by word id
+        self.engagement_scores = np.zeros(0, dtype=np.float64)
+        self.rows_seen = 0
+        
+        # Sliding-window, decayed and velocity counts over tweet timestamps
+        self.trends = TrendEngine() if trends is None else trends
+        
+        # Per-word hourly mention counts for burst detection
+        self.bursts = BurstDetector()
+    
+    def update(self, tokens, texts, likes, retweets, timestamps=None, authors=None, weights=None):
+        """
+        Fold a batch of tokenized tweets, with their raw texts, into the running counts.
+        Weights scale each tweet's words, engagement and phrases; tweets weighted 0 still
+        count towards topics and the time-based trends.
+        """
+        matcher = self.keyword_matcher
+        trends = self.trends
+        
+        tokens = list(tokens)
+        self._add_content(tokens, likes, retweets, authors, weights)
+        if self.topics is not None:
+            self.topics.partial_fit(tokens)
+        
+        if timestamps is None:
+            timestamps = repeat(None)
+        else:
+            self.bursts.update(tokens, timestamps)
+            
+            # Crypto hits of every tweet, grouped by period in one go
+            hits = [matcher.matches(text.lower()) if isinstance(text, str) else [] for text in texts]
+            self.period_counts.update(hits, timestamps)
+        
+        for row_tokens, timestamp in zip(tokens, timestamps):
+            # Missing dates come through as None or NaN
+            if timestamp is not None and timestamp == timestamp:
+                trends.add(timestamp, row_tokens)
+        
+        self.rows_seen += len(tokens)
+    
+    def _add_content(self, tokens, likes, retweets, authors=None, weights=None):
+        """Count the words, engagement and phrases of the tweets that carry weight"""
+        if weights is not None:
+            kept = np.flatnonzero(weights)
+            tokens = [tokens[i] for i in kept]
+            likes, retweets = np.asarray(likes)[kept], np.asarray(retweets)[kept]
+            authors = None if authors is None else np.asarray(authors, dtype=object)[kept]
+            weights = np.asarray(weights, dtype=np.float64)[kept]
+        
+        token_ids = self.vocabulary.add_tokens(tokens, authors, weights)
+        self._add_engagement(tokens, token_ids, likes, retweets, weights)
+        self.phrases.add_tokens(tokens, weights)
+    
+    def _add_engagement(self, tokens, token_ids, likes, retweets, tweet_weights=None):
+        """Add every tweet's log-scaled likes and retweets, times its weight, to the scores of its words"""
+        weights = (np.log1p(np.clip(np.nan_to_num(np.asarray(likes, dtype=np.float64)), 0, None))
+                   + np.log1p(np.clip(np.nan_to_num(np.asarray(retweets, dtype=np.float64)), 0, None)))
+        if tweet_weights is not None:
+            weights = weights * tweet_weights
+        
+        # Tweet-by-word term counts, so the scores are one sparse vector-matrix product
+        from scipy.sparse import csr_matrix
+        lengths = np.fromiter((len(row_tokens) for row_tokens in tokens), dtype=np.int64, count=len(tokens))
+        indptr = np.concatenate([[0], np.cumsum(lengths)])
+        terms = csr_matrix((np.ones(len(token_ids)), token_ids, indptr), shape=(len(tokens), len(self.vocabulary)))
+        
+        scores = self.engagement_scores
+        if len(scores) < len(self.vocabulary):
+            scores = np.concatenate([scores, np.zeros(len(self.vocabulary) - len(scores))])
+        self.engagement_scores = scores + terms.T @ weights
+    
+    def engagement_words(self, top_n=20):
+        """Words with the highest engagement-weighted scores, ties going to the word seen first"""
+        scores = self.engagement_scores
+        return [(self.vocabulary.words[i], round(float(scores[i]), 4))
+                for i in top_ids(scores, np.flatnonzero(scores > 0), top_n)]
+    
+    def period_trends(self, top_n=10):
+        """Most common crypto keywords and phrases for every period seen, oldest first"""
+        return self.period_counts.top(top_n)
+
+class CelebrityCryptoAnalyzer:
+    def __init__(self, tokenizer='regex', token_cache_size=100000, workers=1, counting='exact',
+                 sketch_error=0.0001, sketch_confidence=0.99, heavy_hitters=1000, author_breadth=0.0,
+                 duplicate_weight=None, duplicate_threshold=0.7, model_cache_dir=MODEL_CACHE_DIR,
+                 period_granularity='month', report_cache=REPORT_CACHE, trend_windows=DEFAULT_WINDOWS,
+                 trend_half_life=6 * 3600, velocity_window='24h'):
+        if tokenizer not in TOKENIZERS:
+            raise ValueError(f"Unknown tokenizer '{tokenizer}', expected one of {sorted(TOKENIZERS)}")
+        if counting not in ('exact', 'approximate'):
+            raise ValueError(f"Unknown counting mode '{counting}', expected 'exact' or 'approximate'")
+        if period_granularity not in PERIOD_FREQUENCIES:
+            raise ValueError(f"Unknown period granularity '{period_granularity}', "
+                             f"expected one of {sorted(PERIOD_FREQUENCIES)}")
+        if velocity_window not in trend_windows:
+            raise ValueError(f"Unknown velocity window '{velocity_window}', expected one of {sorted(trend_windows)}")
+        
         self.data = None
+        self.data_source = None
+        
+        # The frame load_data read from data_source; data assigned directly has no source
+        self._source_frame = None
+        self.tokenizer = tokenizer
+        
+        # Processes used to count words when extract_trending_words runs on a large corpus
+        self.workers = workers
+        
+        # 'approximate' counts trending words with fixed-memory sketches instead of a full vocabulary
+        self.counting = counting
+        self.sketch_error = sketch_error
+        self.sketch_confidence = sketch_confidence
+        self.heavy_hitters = heavy_hitters
+        
+        # Scores are multiplied by (distinct authors) ** author_breadth; 0 ignores authors.
+        # Authors are counted with HyperLogLog sketches in exact counting mode only.
+        self.author_breadth = author_breadth
+        
+        # With a duplicate_weight, trending words and the reports' words, engagement and phrases
+        # count each cluster of near-identical tweets once, plus duplicate_weight for every
+        # other tweet in it. 0 counts clusters once.
+        self.duplicate_weight = duplicate_weight
+        self.duplicate_threshold = duplicate_threshold
+        
+        # Calendar period the report's keyword trends are grouped by: day, week, month or year
+        self.period_granularity = period_granularity
+        
+        # Sliding windows as {name: (window length, bucket width)} in seconds, the half-life
+        # of the decayed scores, and the window whose buckets velocities compare
+        self.trend_windows = {name: tuple(spec) for name, spec in trend_windows.items()}
+        self.trend_half_life = trend_half_life
+        self.velocity_window = velocity_window
+        
+        # Fitted topic models by tweet file and corpus fingerprint; None refits every report
+        self.model_cache_dir = model_cache_dir
+        
+        # Results by data fingerprint, settings and parameters; None recomputes every call
+        self.report_cache = report_cache
+        self._fingerprinted = (None, None)
+        
+        # Tokens per distinct tweet text: {text: [tokens]}, least recently used evicted first
+        self.token_cache = OrderedDict()
+        self.token_cache_size = token_cache_size
+        
+        ensure_nltk_data(NLTK_RESOURCES[tokenizer])
+        from nltk.corpus import stopwords
         self.stop_words = set(stopwords.words('english'))
         self.custom_stop_words = {
             'https', 'http', 'co', 't', 'amp', 'rt', 'the', 'a', 'an', 'in', 'on', 
@@ -54,16 +412,37 @@ class CelebrityCryptoAnalyzer:
             'queen', 'takeover', 'green', 'candle', 'bags', 'flippening'
         }
         
+        # Multi-word signals, matched in the raw tweet text alongside the keywords
+        self.crypto_phrases = {
+            'diamond hands', 'paper hands', 'laser eyes', 'to the moon', 'buy the dip',
+            'wen lambo', 'wen moon', 'few understand', 'number go up', 'rug pull',
+            'green candle', 'not financial advice', 'we are so back', 'send it'
+        }
+        self.keyword_matcher = KeywordMatcher(self.crypto_keywords | self.crypto_phrases, regex_tokenize)
+        
         # User wishlists dictionary: {user_id: [words]}
         self.user_wishlists = {}
         
         # Notification history: {user_id: [notifications]}
         self.notifications = {}
         
-    def load_data(self, csv_file_path):
-        """Load tweet data from CSV file"""
+    def load_data(self, file_path, columns=REPORT_COLUMNS):
+        """
+        Load tweet data from a CSV, Parquet or Feather/Arrow file. Columnar files are
+        memory-mapped and only the given columns are read.
+        """
         try:
-            self.data = pd.read_csv(csv_file_path)
+            if file_path.endswith(('.feather', '.arrow')):
+                import pyarrow.feather as feather
+                self.data = feather.read_table(file_path, columns=columns, memory_map=True).to_pandas()
+            elif file_path.endswith('.parquet'):
+                import pyarrow.parquet as pq
+                self.data = pq.read_table(file_path, columns=columns, memory_map=True).to_pandas()
+            else:
+                self.data = pd.read_csv(file_path)
+            self.data = coerce_tweets(self.data)
+            self.data_source = file_path
+            self._source_frame = self.data
             print(f"Loaded {len(self.data)} tweets successfully")
             return True
         except Exception as e:
@@ -74,69 +453,212 @@ class CelebrityCryptoAnalyzer:
         """Clean and preprocess tweet text"""
         if not isinstance(text, str):
             return ""
-            
-        # Convert to lowercase
-        text = text.lower()
         
-        # Remove URLs
-        text = re.sub(r'https?://\S+', '', text)
+        if text in self.token_cache:
+            self.token_cache.move_to_end(text)
+            return self.token_cache[text]
         
-        # Remove mentions
-        text = re.sub(r'@\w+', '', text)
-        
-        # Remove hashtag symbol but keep the text
-        text = re.sub(r'#(\w+)', r'\1', text)
-        
-        # Remove punctuation and special characters
-        text = re.sub(r'[^\w\s]', '', text)
+        cleaned_tokens = self._tokenize_text(text)
+        self._cache_tokens(text, cleaned_tokens)
+        return cleaned_tokens
+    
+    def _cache_tokens(self, text, tokens):
+        """Store tokens for a tweet text, evicting the least recently used entries"""
+        self.token_cache[text] = tokens
+        self.token_cache.move_to_end(text)
+        while len(self.token_cache) > self.token_cache_size:
+            self.token_cache.popitem(last=False)
+    
+    def _tokenize_text(self, text):
+        """Tokenize a single tweet text without consulting the token cache"""
+        return preprocess(text, self.stop_words, self.tokenizer)
+    
+    def preprocess_texts(self, texts):
+        """Clean and preprocess a whole column of tweet text in one go"""
+        # Object dtype keeps Python regex semantics (unicode \w and \s)
+        texts = texts.astype(object).where(texts.map(lambda text: isinstance(text, str)), '')
         
-        # Tokenize
-        tokens = word_tokenize(text)
+        # Identical texts (retweets, copy-pasted shills) are tokenized once
+        codes, uniques = pd.factorize(texts)
+        unique_tokens = {}
+        missing = []
+        for text in uniques:
+            if text in self.token_cache:
+                self.token_cache.move_to_end(text)
+                unique_tokens[text] = self.token_cache[text]
+            else:
+                missing.append(text)
         
-        # Remove stopwords
-        cleaned_tokens = [word for word in tokens if word not in self.stop_words and len(word) > 2]
+        if missing:
+            tokenized = self._tokenize_texts(pd.Series(missing, dtype=object))
+            for text, tokens in zip(missing, tokenized):
+                unique_tokens[text] = tokens
+                self._cache_tokens(text, tokens)
         
-        return cleaned_tokens
+        tokens = pd.Series([unique_tokens[text] for text in uniques], dtype=object)
+        return pd.Series(tokens.to_numpy()[codes], index=texts.index)
+    
+    def _tokenize_texts(self, texts):
+        """Tokenize a column of tweet texts without consulting the token cache"""
+        stop_words = self.stop_words
+        tokenizer = self.tokenizer
+        return texts.map(lambda text: preprocess(text, stop_words, tokenizer))
+    
+    def tokenize_data(self):
+        """Tokenize the loaded tweets once and keep the result as the 'tokens' column"""
+        if 'tokens' not in self.data.columns:
+            self.data['tokens'] = self.preprocess_texts(self.data['Text'])
+        return self.data['tokens']
     
-    def extract_trending_words(self, min_count=3, top_n=50):
-        """Extract trending words with potential for memecoins"""
+    def extract_trending_words(self, min_count=3, top_n=50, verify=False):
+        """
+        Extract trending words with potential for memecoins. In approximate counting
+        mode, verify=True recounts the candidate words exactly in a second pass.
+        """
         if self.data is None:
             print("No data loaded. Please load data first.")
             return []
         
-        all_words = []
-        
-        for _, row in self.data.iterrows():
-            tokens = self.preprocess_text(row['Text'])
-            all_words.extend(tokens)
+        cache_key = self._cache_key('trending_words', min_count, top_n, verify)
+        trending_words = self._cached(cache_key)
+        if trending_words is not None:
+            return trending_words
         
         # Count word frequencies
-        word_counts = Counter(all_words)
+        if self.duplicate_weight is not None and self.counting == 'exact':
+            rows, weights = self._deduplicate(self.data['Text'])
+            tweets = self.data.iloc[rows]
+            vocabulary = Vocabulary()
+            vocabulary.add_tokens(self.preprocess_texts(tweets['Text']), self._tweet_authors(tweets), weights)
+        elif self.counting == 'approximate':
+            tokens = self.tokenize_data()
+            vocabulary = self._approximate_vocabulary([tokens], [tokens] if verify else None)
+        elif self.workers > 1 and 'tokens' not in self.data.columns and not self.author_breadth:
+            vocabulary = self._count_words_parallel()
+        else:
+            vocabulary = Vocabulary()
+            vocabulary.add_tokens(self.tokenize_data(), self._tweet_authors(self.data))
         
-        # Filter words that appear at least min_count times
-        frequent_words = {word: count for word, count in word_counts.items() 
-                         if count >= min_count}
+        return self._store(cache_key, self.score_words(vocabulary, min_count, top_n))
+    
+    def stream_trending_words(self, csv_file_paths, chunksize=50000, min_count=3, top_n=50, verify=False):
+        """
+        Extract trending words across one or more CSVs read in fixed-size chunks, e.g. every
+        tracked celebrity at once. Use counting='approximate' to keep memory fixed as well.
+        """
+        if isinstance(csv_file_paths, str):
+            csv_file_paths = [csv_file_paths]
         
-        # Calculate memecoin potential score
-        word_scores = {}
-        for word, count in frequent_words.items():
-            # Base score is the count
-            score = count
-            
-            # Boost score if it's in our crypto keywords list
-            if word in self.crypto_keywords:
-                score *= 1.5
-                
-            # Boost score for shorter words (more memeable)
-            if 3 <= len(word) <= 6:
-                score *= 1.2
-                
-            word_scores[word] = score
+        columns = ['Text', 'Username'] if self.author_breadth and self.counting == 'exact' else ['Text']
+        
+        def chunks():
+            for csv_file_path in csv_file_paths:
+                yield from pd.read_csv(csv_file_path, chunksize=chunksize, usecols=columns)
+        
+        def token_batches():
+            for chunk in chunks():
+                yield self.preprocess_texts(chunk['Text'])
+        
+        try:
+            if self.counting == 'approximate':
+                vocabulary = self._approximate_vocabulary(token_batches(), token_batches() if verify else None)
+            else:
+                vocabulary = Vocabulary()
+                for chunk in chunks():
+                    vocabulary.add_tokens(self.preprocess_texts(chunk['Text']), self._tweet_authors(chunk))
+        except Exception as e:
+            print(f"Error loading data: {e}")
+            return []
+        
+        return self.score_words(vocabulary, min_count, top_n)
+    
+    def _deduplicate(self, texts):
+        """
+        Positions of the first tweet of every near-duplicate cluster, in order, with each
+        cluster's weight. Only those tweets need tokenizing.
+        """
+        # Identical texts are grouped up front, so MinHash only sees distinct texts
+        codes, uniques = pd.factorize(texts.astype(object), use_na_sentinel=False)
+        detector = NearDuplicateDetector(threshold=self.duplicate_threshold)
+        clusters = detector.clusters([text if isinstance(text, str) else '' for text in uniques])[codes]
+        
+        rows, sizes = np.unique(clusters, return_index=True, return_counts=True)[1:]
+        order = np.argsort(rows)
+        return rows[order], 1 + self.duplicate_weight * (sizes[order] - 1)
+    
+    def _tweet_weights(self, texts):
+        """
+        Report weight of every tweet when near-duplicates are down-weighted: the first tweet
+        of a cluster carries the cluster's weight and its copies 0. None when they aren't.
+        Clusters are found within the texts given, so a streamed or incremental report
+        only merges copies that arrive in the same batch.
+        """
+        if self.duplicate_weight is None:
+            return None
+        rows, cluster_weights = self._deduplicate(texts)
+        weights = np.zeros(len(texts), dtype=np.float64)
+        weights[rows] = cluster_weights
+        return weights
+    
+    def _approximate_vocabulary(self, token_batches, verify_batches=None):
+        """Candidate trending words counted with sketches, optionally recounted exactly"""
+        counter = ApproximateCounter(self.sketch_error, self.sketch_confidence, self.heavy_hitters)
+        for tokens in token_batches:
+            counter.add_tokens(tokens)
+        words, counts = counter.candidates()
+        
+        # The second pass only counts the candidates, so memory stays bounded
+        if verify_batches is not None:
+            candidates = pd.Index(words)
+            counts = np.zeros(len(words), dtype=np.int64)
+            for tokens in verify_batches:
+                positions = candidates.get_indexer(np.array(list(chain.from_iterable(tokens)), dtype=object))
+                counts += np.bincount(positions[positions >= 0], minlength=len(words))
+        
+        vocabulary = Vocabulary()
+        vocabulary.add_counts(words, counts)
+        return vocabulary
+    
+    def _count_words_parallel(self):
+        """Count words over the Text column in one shard per worker process"""
+        texts = self.data['Text'].tolist()
+        shard_size = max(1, -(-len(texts) // self.workers))
+        shards = [texts[start:start + shard_size] for start in range(0, len(texts), shard_size)]
         
-        # Sort by score and take top N
-        trending_words = sorted(word_scores.items(), key=lambda x: x[1], reverse=True)[:top_n]
+        # Merging shards in order keeps first-seen word order, so ties sort as in the serial path
+        vocabulary = Vocabulary()
+        # Spawned workers don't share this process's NLTK path, so each one checks its data first
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=ensure_nltk_data,
+                                 initargs=(NLTK_RESOURCES[self.tokenizer],)) as pool:
+            for shard_counts in pool.map(count_words, shards, repeat(self.stop_words), repeat(self.tokenizer)):
+                vocabulary.add_counts(list(shard_counts), np.fromiter(shard_counts.values(), dtype=np.int64,
+                                                                      count=len(shard_counts)))
         
-        return trending_words
+        return vocabulary
+    
+    def score_words(self, vocabulary, min_count=3, top_n=50):
+        """Turn vocabulary counts into the top N memecoin potential scores"""
+        counts = vocabulary.counts
+        lengths = vocabulary.lengths
+        
+        # Boost crypto keywords and shorter (more memeable) words
+        crypto = pd.Index(vocabulary.words, dtype=object).isin(self.crypto_keywords)
+        short = (lengths >= 3) & (lengths <= 6)
+        scores = counts.astype(np.float64)
+        scores[crypto] *= 1.5
+        scores[short] *= 1.2
+        boosted = crypto | short
+        
+        # Words used by many distinct accounts outrank one account repeating them
+        if self.author_breadth and vocabulary.authors is not None:
+            breadth = np.maximum(vocabulary.authors.estimate(vocabulary.words), 1.0)
+            scores *= breadth ** self.author_breadth
+            boosted = np.ones(len(scores), dtype=bool)
+        
+        # Only words that appear at least min_count times can trend
+        candidates = np.flatnonzero(counts >= min_count)
+        return [(vocabulary.words[i], scores[i].item() if boosted[i] else counts[i].item())
+                for i in top_ids(scores, candidates, top_n)]
     
     def generate_memecoin_trends_report(self):
         """
@@ -145,43 +667,274 @@ class CelebrityCryptoAnalyzer:
         if self.data is None:
             print("No data loaded. Please load data first.")
             return None
+        
+        cache_key = self._cache_key('report')
+        report = self._cached_report(cache_key)
+        if report is not None:
+            return report
             
-        # Overall trending words
-        trending_words = self.extract_trending_words(min_count=3, top_n=30)
+        # Time-based analysis (assuming 'Created At' is a timestamp)
+        try:
+            self.data['date'] = tweet_dates(self.data['Created At'])
+            timestamps = epoch_seconds(self.data['date'])
+        except:
+            timestamps = None
         
-        # Engagement analysis
-        top_engagement = self.data.sort_values(by='Likes', ascending=False).head(10)
-        top_engagement_words = []
+        # Overall words, engagement and crypto keywords by period in a single pass
+        engine = self._report_accumulator(cluster_topics=False)
+        engine.update(self.tokenize_data(), self.data['Text'], self.data['Likes'], self.data['Retweets'],
+                      timestamps, self._tweet_authors(self.data), self._tweet_weights(self.data['Text']))
+        engine.topics = self._topic_model(self.data, self.tokenize_data())
         
-        for _, row in top_engagement.iterrows():
-            tokens = self.preprocess_text(row['Text'])
-            top_engagement_words.extend(tokens)
-            
-        top_engagement_counts = Counter(top_engagement_words)
+        # A cached model may have been fitted on older tweets too, so size topics by the loaded ones
+        labels = engine.topics.predict(self.tokenize_data())
+        topic_sizes = np.bincount(labels[labels >= 0], minlength=engine.topics.num_topics)
+        
+        return self._store(cache_key, self._build_report(engine, dates_parsed=timestamps is not None,
+                                                         topic_sizes=topic_sizes))
+    
+    def stream_memecoin_trends_report(self, csv_file_path, chunksize=50000):
+        """
+        Generate the memecoin trends report from a CSV read in fixed-size chunks,
+        so memory depends on the chunk size rather than the file size
+        """
+        engine = self._report_accumulator()
+        dates_parsed = False
         
-        # Time-based analysis (assuming 'Created At' is a timestamp)
         try:
-            self.data['date'] = pd.to_datetime(self.data['Created At'])
-            self.data['month'] = self.data['date'].dt.month
-            
-            # Count crypto keywords by month
-            monthly_trends = {}
-            for month in self.data['month'].unique():
-                month_data = self.data[self.data['month'] == month]
-                month_words = []
+            for chunk in pd.read_csv(csv_file_path, chunksize=chunksize):
+                chunk = coerce_tweets(chunk)
+                
+                # A chunk whose dates can't be parsed is left out of the time trends on its own
+                timestamps = self._tweet_times(chunk)
+                dates_parsed |= timestamps is not None
                 
-                for _, row in month_data.iterrows():
-                    tokens = self.preprocess_text(row['Text'])
-                    crypto_tokens = [token for token in tokens if token in self.crypto_keywords]
-                    month_words.extend(crypto_tokens)
-                    
-                monthly_trends[month] = Counter(month_words).most_common(10)
+                engine.update(self.preprocess_texts(chunk['Text']), chunk['Text'], chunk['Likes'], chunk['Retweets'],
+                              timestamps, self._tweet_authors(chunk), self._tweet_weights(chunk['Text']))
+        except Exception as e:
+            print(f"Error loading data: {e}")
+            return None
+        
+        print(f"Streamed {engine.rows_seen} tweets successfully")
+        return self._build_report(engine, dates_parsed)
+    
+    def generate_incremental_report(self, username, state_dir=TREND_STATE_DIR):
+        """
+        Generate the memecoin trends report for a celebrity from counts persisted on
+        earlier calls, processing only the loaded tweets that haven't been seen before
+        """
+        if self.data is None:
+            print("No data loaded. Please load data first.")
+            return None
+        
+        state_path = os.path.join(state_dir, re.sub(r'\W', '_', username) + '.pkl')
+        
+        # The report only changes with the loaded data or the state file, so a pair seen before is cached
+        report = self._cached_report(self._cache_key('incremental', state_path, self._state_stamp(state_path)))
+        if report is not None:
+            return report
+        
+        with state_locks.setdefault(os.path.abspath(state_path), threading.Lock()):
+            state = self._load_trend_state(state_path)
+            new_count = self._update_trend_state(state_path, state)
+            cache_key = self._cache_key('incremental', state_path, self._state_stamp(state_path))
+        
+        print(f"Processed {new_count} new tweets for {username}")
+        return self._store(cache_key, self._build_report(state['engine'], state['dates_parsed']))
+    
+    def _update_trend_state(self, state_path, state):
+        """
+        Fold the loaded tweets the state hasn't seen into it, saving it when any were new;
+        returns how many were
+        """
+        # Seen keys are kept sorted, so membership is a binary search rather than a set operation
+        seen = state['seen']
+        tweet_keys = self._tweet_keys(self.data)
+        if len(seen):
+            is_new = seen[np.minimum(np.searchsorted(seen, tweet_keys), len(seen) - 1)] != tweet_keys
+        else:
+            is_new = np.ones(len(tweet_keys), dtype=bool)
+        new_tweets = self.data[is_new]
+        
+        engine = state['engine']
+        if len(new_tweets):
+            # A batch whose dates can't be parsed is left out of the time trends on its own
+            timestamps = self._tweet_times(new_tweets)
+            state['dates_parsed'] |= timestamps is not None
+            
+            engine.update(self.preprocess_texts(new_tweets['Text']), new_tweets['Text'], new_tweets['Likes'],
+                          new_tweets['Retweets'], timestamps, self._tweet_authors(new_tweets),
+                          self._tweet_weights(new_tweets['Text']))
+            new_keys = np.unique(tweet_keys[is_new])
+            state['seen'] = np.insert(seen, np.searchsorted(seen, new_keys), new_keys)
+            self._save_trend_state(state_path, state)
+        return len(new_tweets)
+    
+    def _cache_key(self, *params):
+        """
+        Report cache key from the loaded data's content, every setting that changes results
+        and the call's parameters; None when caching is off
+        """
+        if self.report_cache is None:
+            return None
+        
+        # The fingerprint is kept for the loaded frame, so repeat calls skip hashing it
+        frame, fingerprint = self._fingerprinted
+        if frame is not self.data:
+            columns = [column for column in REPORT_COLUMNS if column in self.data.columns]
+            hashes = pd.util.hash_pandas_object(self.data[columns], index=False).to_numpy()
+            fingerprint = hashlib.blake2b(hashes.tobytes(), digest_size=16).hexdigest()
+            self._fingerprinted = (self.data, fingerprint)
+        
+        settings = (self.tokenizer, self.counting, self.sketch_error, self.sketch_confidence, self.heavy_hitters,
+                    self.author_breadth, self.duplicate_weight, self.duplicate_threshold, self.period_granularity,
+                    tuple(sorted(self.trend_windows.items())), self.trend_half_life, self.velocity_window,
+                    frozenset(self.stop_words), frozenset(self.crypto_keywords), frozenset(self.crypto_phrases))
+        return (fingerprint, settings) + params
+    
+    def _cached(self, cache_key):
+        """Cached result for the key, or None"""
+        if cache_key is None:
+            return None
+        return self.report_cache.get(cache_key)
+    
+    def _cached_report(self, cache_key):
+        """Cached report for the key, stamped with the time it is served, or None"""
+        report = self._cached(cache_key)
+        if report is not None:
+            report['report_generated_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return report
+    
+    def _store(self, cache_key, result):
+        """Cache a result under the key and pass it through"""
+        if cache_key is not None:
+            self.report_cache.put(cache_key, result)
+        return result
+    
+    def _tweet_keys(self, tweets):
+        """64-bit key of every tweet, identifying it by creation time and text"""
+        return pd.util.hash_pandas_object(tweets[['Created At', 'Text']], index=False).to_numpy()
+    
+    def _topic_model(self, tweets, tokens):
+        """
+        Topic clusterer for the tweets, loaded from the model cache when they were clustered
+        before and otherwise warm-started with only the tweets the cached model hasn't seen
+        """
+        # Only tweets read from a file have a lineage of models to warm-start from
+        if self.model_cache_dir is None or tweets is not self._source_frame:
+            clusterer = TopicClusterer()
+            clusterer.partial_fit(tokens)
+            return clusterer
+        
+        # The full path tells apart files that share a name in different directories
+        path = os.path.abspath(self.data_source)
+        path_hash = hashlib.blake2b(path.encode(), digest_size=4).hexdigest()
+        source = re.sub(r'\W', '_', f"{self.tokenizer}_{os.path.basename(path)}_{path_hash}")
+        cache = TopicModelCache(self.model_cache_dir)
+        tweet_keys = self._tweet_keys(tweets)
+        clusterer, seen = cache.load(source, tweet_keys)
+        
+        is_new = ~np.isin(tweet_keys, seen)
+        if clusterer is None or is_new.any():
+            clusterer = clusterer or TopicClusterer()
+            clusterer.partial_fit(tokens[is_new])
+            cache.save(source, tweet_keys, np.union1d(seen, tweet_keys[is_new]), clusterer)
+        return clusterer
+    
+    def _tweet_authors(self, tweets):
+        """The Username column when author breadth feeds the scores, otherwise None"""
+        if self.author_breadth and 'Username' in tweets.columns:
+            return tweets['Username']
+        return None
+    
+    def _tweet_times(self, tweets):
+        """Epoch seconds of each tweet, or None when dates can't be parsed"""
+        try:
+            dates = tweet_dates(tweets['Created At'])
         except:
+            return None
+        return epoch_seconds(dates)
+    
+    def _state_stamp(self, state_path):
+        """Identity of the state file as last written, or None when there is none"""
+        try:
+            stat = os.stat(state_path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    
+    def _report_accumulator(self, cluster_topics=True):
+        """An empty ReportAccumulator with the analyzer's keywords, periods and trend windows"""
+        trends = TrendEngine(self.trend_windows, self.trend_half_life, self.velocity_window)
+        return ReportAccumulator(self.keyword_matcher, cluster_topics, self.period_granularity, trends)
+    
+    def _state_settings(self):
+        """Settings persisted state was counted with; state counted any other way is rebuilt"""
+        return (self.tokenizer, self.period_granularity, self.duplicate_weight, self.duplicate_threshold,
+                tuple(sorted(self.trend_windows.items())), self.trend_half_life, self.velocity_window,
+                frozenset(self.stop_words), frozenset(self.crypto_keywords), frozenset(self.crypto_phrases))
+    
+    def _load_trend_state(self, state_path):
+        """Read persisted report state, starting over when it is missing, outdated or unreadable"""
+        try:
+            with open(state_path, 'rb') as file:
+                state = pickle.load(file)
+            if (state.get('version') == TREND_STATE_VERSION and state.get('settings') == self._state_settings()
+                    and isinstance(state['engine'], ReportAccumulator) and isinstance(state['seen'], np.ndarray)):
+                return state
+        except Exception:
+            # A damaged file must not keep failing every report for the celebrity
+            pass
+        
+        return {
+            'version': TREND_STATE_VERSION,
+            'settings': self._state_settings(),
+            'seen': np.empty(0, dtype=np.uint64),
+            'engine': self._report_accumulator(),
+            
+            # Whether any batch so far had dates that parsed
+            'dates_parsed': False
+        }
+    
+    def _save_trend_state(self, state_path, state):
+        """Persist report state, replacing the previous file atomically"""
+        state_dir = os.path.dirname(state_path) or '.'
+        os.makedirs(state_dir, exist_ok=True)
+        
+        # Each writer gets its own temporary file, so concurrent saves never share one
+        with tempfile.NamedTemporaryFile(dir=state_dir, prefix=os.path.basename(state_path) + '.',
+                                         suffix='.tmp', delete=False) as file:
+            try:
+                pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+            except BaseException:
+                file.close()
+                os.remove(file.name)
+                raise
+        os.replace(file.name, state_path)
+    
+    def _build_report(self, engine, dates_parsed=True, topic_sizes=None):
+        """
+        Assemble the report dict from a filled ReportAccumulator; topic sizes default to
+        every tweet the topic model was fitted on
+        """
+        # Overall trending words
+        trending_words = self.score_words(engine.vocabulary, min_count=3, top_n=30)
+        
+        # Count crypto keywords and phrases by calendar period
+        if dates_parsed:
+            monthly_trends = engine.period_trends(10)
+        else:
             monthly_trends = {"error": "Could not parse dates for time-based analysis"}
         
         report = {
             "overall_trending_words": trending_words,
-            "total_tweets_analyzed": len(self.data),
+            "trending_phrases": engine.phrases.top_phrases(engine.vocabulary, min_count=3, top_n=20),
+            "high_engagement_words": engine.engagement_words(20),
+            "monthly_trends": monthly_trends,
+            "topics": engine.topics.summary(sizes=topic_sizes),
+            "total_tweets_analyzed": engine.rows_seen,
+            "time_trends": engine.trends.snapshot(),
+            "bursts": engine.bursts.detect(),
             "report_generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
         
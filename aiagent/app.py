@@ -1,12 +1,71 @@
 #aiagent/app.py
 from flask import Flask, request, jsonify
 import asyncio
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
 import main
 import agent
 import os
+from topics import TopicClusterer
 
 app = Flask(__name__)
 
+# Scraper output format: 'csv', or 'parquet'/'feather' for faster loading
+TWEETS_FORMAT = os.environ.get('TWEETS_FORMAT', 'csv')
+
+# Seconds a request waits for its scrape before giving up with a 504
+SCRAPE_TIMEOUT_SECONDS = float(os.environ.get('SCRAPE_TIMEOUT_SECONDS', 300))
+
+# One event loop per process, running in a background thread, so the shared twikit
+# client and its HTTP connection pool outlive individual requests. It is started on
+# first use rather than at import, since threads don't survive a fork into workers.
+loop = None
+loop_pid = None
+loop_lock = threading.Lock()
+
+# Set WARM_UP=1 to load the analyzer's deferred imports when the app is imported;
+# otherwise call warm_up() from a post-fork hook, or leave it to the first request
+WARM_UP = os.environ.get('WARM_UP') == '1'
+
+def warm_up():
+    """
+    Load what agent.py defers until an analyzer is built (NLTK, scipy, the stopwords
+    and scikit-learn), so the first /analyze request doesn't pay the ~2s for it.
+    Raises LookupError when the NLTK data is missing.
+    """
+    agent.CelebrityCryptoAnalyzer()
+    TopicClusterer()
+
+if WARM_UP:
+    warm_up()
+
+def get_loop():
+    """This process's service event loop, starting it the first time it is needed"""
+    global loop, loop_pid
+    
+    with loop_lock:
+        if loop_pid != os.getpid():
+            # A forked worker can't use the client or locks bound to its parent's loop
+            if loop is not None:
+                main.client, main.client_lock = None, None
+                main.user_locks.clear()
+            loop = asyncio.new_event_loop()
+            loop_pid = os.getpid()
+            threading.Thread(target=loop.run_forever, name='scraper-loop', daemon=True).start()
+        return loop
+
+def run_async(coroutine, timeout=SCRAPE_TIMEOUT_SECONDS):
+    """
+    Run a coroutine on the service event loop and wait for its result, cancelling it
+    and raising concurrent.futures.TimeoutError when it takes longer than timeout seconds
+    """
+    future = asyncio.run_coroutine_threadsafe(coroutine, get_loop())
+    try:
+        return future.result(timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise
+
 @app.route('/analyze', methods=['GET'])
 def analyze():
     # Get the username from the query parameters
@@ -17,7 +76,9 @@ def analyze():
     
     # Fetch tweets for the provided username
     try:
-        csv_file_path = asyncio.run(main.fetch_tweets_for_user(username))
+        csv_file_path = run_async(main.fetch_tweets_for_user(username, TWEETS_FORMAT), SCRAPE_TIMEOUT_SECONDS)
+    except FutureTimeoutError:
+        return jsonify({"error": f"Timed out fetching tweets after {SCRAPE_TIMEOUT_SECONDS:g}s"}), 504
     except Exception as e:
         return jsonify({"error": f"Failed to fetch tweets: {str(e)}"}), 500
     
@@ -26,12 +87,15 @@ def analyze():
         return jsonify({"error": "Failed to create CSV file"}), 500
     
     # Analyze the tweets using agent.py
-    analyzer = agent.CelebrityCryptoAnalyzer()
+    try:
+        analyzer = agent.CelebrityCryptoAnalyzer()
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 500
     if not analyzer.load_data(csv_file_path):
         return jsonify({"error": "Failed to load data for analysis"}), 500
     
-    # Generate the report
-    report = analyzer.generate_memecoin_trends_report()
+    # Generate the report, only processing tweets this celebrity hasn't had analyzed before
+    report = analyzer.generate_incremental_report(username)
     
     # Return the report as JSON
     return jsonify(report)
@@ -0,0 +1,60 @@
+# aiagent/bench_import.py
+import os
+import subprocess
+import sys
+import tempfile
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def run_python(*args):
+    """Run a fresh interpreter that imports from this directory; the scraper's log lands in a scratch directory"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [MODULE_DIR, os.environ.get('PYTHONPATH')])))
+    with tempfile.TemporaryDirectory() as scratch:
+        return subprocess.run([sys.executable, *args], cwd=scratch, env=env, capture_output=True, text=True, check=True)
+
+def import_times(module):
+    """Name, nesting depth and cumulative microseconds of every module importing the module loads"""
+    times = []
+    for line in run_python('-X', 'importtime', '-c', f'import {module}').stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        # importtime indents each name by two spaces per level of nesting
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        times.append((name.strip(), depth, int(cumulative_us)))
+
+    # Modules are listed as they finish, so the module's own imports are the lines just
+    # before it back to the previous top-level one (interpreter startup comes earlier)
+    end = max(i for i, (name, depth, _) in enumerate(times) if name == module and depth == 0)
+    start = end
+    while start > 0 and times[start - 1][1] > 0:
+        start -= 1
+    return times[start:end + 1]
+
+def first_analyzer_seconds():
+    """Seconds a fresh interpreter spends building its first analyzer, imports included"""
+    code = ('import time, agent; start = time.perf_counter(); agent.CelebrityCryptoAnalyzer(); '
+            'print(time.perf_counter() - start)')
+    return float(run_python('-c', code).stdout.split()[-1])
+
+def report(module):
+    times = import_times(module)
+    print(f"import {module}: {times[-1][2] / 1e6:.3f}s across {len(times)} modules")
+
+    # The module's own imports are the ones worth deferring
+    direct = [(name, cumulative) for name, depth, cumulative in times if depth == 1]
+    for name, cumulative in sorted(direct, key=lambda item: -item[1])[:10]:
+        print(f"{cumulative / 1e6:8.3f}s  {name}")
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2:
+        print("Usage: python bench_import.py [module]")
+        sys.exit(1)
+
+    # The service imports app, which pulls in agent, the scraper and Flask
+    for module in sys.argv[1:] or ['agent', 'app']:
+        report(module)
+        print()
+
+    # NLTK, scipy and scikit-learn load when the first analyzer is built, not on import
+    print(f"First CelebrityCryptoAnalyzer(): {first_analyzer_seconds():.3f}s")
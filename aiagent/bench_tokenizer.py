@@ -0,0 +1,40 @@
+# aiagent/bench_tokenizer.py
+import random
+import sys
+import time
+import pandas as pd
+from agent import NLTK_RESOURCES, TOKENIZERS, ensure_nltk_data
+
+def synthetic_tweets(count=20000, seed=0):
+    """Tweets mixing plain words with the markup both tokenizers have to strip"""
+    rng = random.Random(seed)
+    words = ['doge', 'pepe', 'moon', 'rocket', 'buy', 'hold', 'cannot', 'gonna', 'café', 'the', 'to', 'wif']
+    extras = ['https://t.co/abc123', '@elonmusk', '#crypto', '🚀', '$shib', "don't", '100x!!']
+    return [' '.join(rng.choice(words + extras) for _ in range(rng.randint(5, 30))) for _ in range(count)]
+
+def bench(tokenize, texts, repeat):
+    """Best wall time over repeat runs of tokenizing every text"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            tokenize(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2:
+        print("Usage: python bench_tokenizer.py [csv_file]")
+        sys.exit(1)
+
+    # Tweets from the CSV when given, otherwise synthetic ones
+    if len(sys.argv) == 2:
+        texts = pd.read_csv(sys.argv[1], usecols=['Text'])['Text'].dropna().astype(str).str.lower().tolist()
+    else:
+        texts = [text.lower() for text in synthetic_tweets()]
+    ensure_nltk_data(NLTK_RESOURCES['nltk'])
+
+    timings = {name: bench(tokenize, texts, repeat=3) for name, tokenize in TOKENIZERS.items()}
+    for name, seconds in timings.items():
+        print(f"{name:>6}: {seconds:.3f}s for {len(texts)} tweets ({len(texts) / seconds:,.0f} tweets/s)")
+    print(f"speedup: {timings['nltk'] / timings['regex']:.1f}x")
@@ -0,0 +1,50 @@
+# aiagent/cache.py
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+class ReportCache:
+    """
+    In-process LRU cache with a time-to-live, shared by analyzers across requests.
+    Expired entries are dropped when looked up, and the least recently used entry is
+    evicted once max_entries is reached. Values are kept pickled, so every get returns a
+    fresh copy callers are free to modify, for far less than a deep copy costs.
+    """
+
+    def __init__(self, max_entries=128, ttl_seconds=600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        """Cached value for the key, or default when it is missing or expired"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return default
+
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self.entries[key]
+                return default
+
+            self.entries.move_to_end(key)
+        return pickle.loads(value)
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entries beyond max_entries"""
+        value = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
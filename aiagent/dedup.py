@@ -0,0 +1,94 @@
+# aiagent/dedup.py
+import re
+import numpy as np
+from sketches import hash_words
+
+# URLs differ between copies of the same shill tweet, so they are left out of the shingles
+URL_PATTERN = re.compile(r'https?://\S+')
+WORD_PATTERN = re.compile(r'\w+')
+
+def shingle_words(text):
+    """Words of a lowercased tweet with URLs removed; an empty tweet is one empty word"""
+    return WORD_PATTERN.findall(URL_PATTERN.sub(' ', text.lower())) or ['']
+
+class NearDuplicateDetector:
+    """
+    Groups near-identical texts with MinHash signatures and LSH banding. Only texts that
+    share a band are compared, so the work grows with the number of texts rather than
+    the number of pairs.
+    """
+
+    def __init__(self, num_perm=64, bands=16, threshold=0.7, seed=0):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        # Estimated Jaccard similarity two texts in a shared band need to be merged
+        self.threshold = threshold
+
+        # One multiply-add hash per permutation; odd multipliers make each a bijection
+        rng = np.random.default_rng(seed)
+        self.multipliers = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self.offsets = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+    def signatures(self, texts):
+        """MinHash signature of every text, shape (len(texts), num_perm)"""
+        text_words = [shingle_words(text) for text in texts]
+        lengths = np.fromiter((len(words) for words in text_words), dtype=np.int64, count=len(text_words))
+        word_hashes = hash_words([word for words in text_words for word in words])
+
+        # Shingles are word bigrams, hashed from the hashes of their two words. Every word
+        # but the last of its tweet starts one; one-word tweets keep their only word.
+        ends = np.cumsum(lengths)
+        next_hashes = np.append(word_hashes[1:], np.uint64(0))
+        bigrams = word_hashes * np.uint64(1000003) ^ next_hashes
+        last = np.zeros(len(word_hashes), dtype=bool)
+        last[ends - 1] = True
+        single = np.repeat(lengths == 1, lengths)
+        hashes = np.where(single, word_hashes, bigrams)[~last | single]
+        starts = np.concatenate([[0], np.cumsum(np.maximum(lengths - 1, 1))[:-1]])
+
+        signatures = np.empty((len(text_words), self.num_perm), dtype=np.uint64)
+        if len(text_words) == 0:
+            return signatures
+        for i, (multiplier, offset) in enumerate(zip(self.multipliers, self.offsets)):
+            signatures[:, i] = np.minimum.reduceat(hashes * multiplier + offset, starts)
+        return signatures
+
+    def clusters(self, texts):
+        """Index of the first text of each text's near-duplicate cluster"""
+        signatures = self.signatures(texts)
+        if len(signatures) == 0:
+            return np.empty(0, dtype=np.int64)
+        parents = list(range(len(signatures)))
+
+        def find(i):
+            while parents[i] != i:
+                parents[i] = parents[parents[i]]
+                i = parents[i]
+            return i
+
+        for band in range(self.bands):
+            columns = signatures[:, band * self.rows:(band + 1) * self.rows]
+            keys = columns[:, 0].copy()
+            for column in columns[:, 1:].T:
+                keys = keys * np.uint64(1000003) ^ column
+
+            # Texts sharing a band key are compared with the first text that has it
+            order = np.lexsort((np.arange(len(keys)), keys))
+            sorted_keys = keys[order]
+            first = np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]])
+            leaders = order[np.flatnonzero(first)[np.cumsum(first) - 1]]
+            followers = ~first
+            leaders, members = leaders[followers], order[followers]
+
+            similar = (signatures[leaders] == signatures[members]).mean(axis=1) >= self.threshold
+            for leader, member in zip(leaders[similar].tolist(), members[similar].tolist()):
+                leader, member = find(leader), find(member)
+                if leader != member:
+                    parents[max(leader, member)] = min(leader, member)
+
+        return np.array([find(i) for i in range(len(parents))], dtype=np.int64)
@@ -0,0 +1,53 @@
+# aiagent/keywords.py
+from collections import deque
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over words: finds every keyword and multi-word phrase of a
+    lexicon in one pass over a text's words, however many entries the lexicon has
+    """
+
+    def __init__(self, lexicon, tokenize=str.split):
+        self.tokenize = tokenize
+
+        # Trie of phrases by word; node 0 is the root
+        self.goto = [{}]
+        self.outputs = [[]]
+        for phrase in sorted(lexicon):
+            node = 0
+            for word in tokenize(phrase):
+                child = self.goto[node].get(word)
+                if child is None:
+                    child = self.goto[node][word] = len(self.goto)
+                    self.goto.append({})
+                    self.outputs.append([])
+                node = child
+            if node:
+                self.outputs[node].append(phrase)
+
+        # Failure links point at the longest phrase suffix that is also a trie path.
+        # Breadth-first order means a node's failure target already has all its outputs.
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for word, child in self.goto[node].items():
+                queue.append(child)
+                target = self.fail[node]
+                while target and word not in self.goto[target]:
+                    target = self.fail[target]
+                self.fail[child] = self.goto[target].get(word, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+
+    def matches(self, text):
+        """Every lexicon entry found in the text, in the order they end"""
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        found = []
+        node = 0
+        for word in self.tokenize(text):
+            while node and word not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(word, 0)
+            if outputs[node]:
+                found.extend(outputs[node])
+        return found
@@ -8,6 +8,7 @@ from random import randint
 import httpx
 import logging
 import os
+from schema import TWEET_COLUMNS, Tweet, to_arrow_table
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, 
@@ -19,17 +20,52 @@ logger = logging.getLogger(__name__)
 MINIMUM_TWEETS = 20
 QUERY = '(doge OR shib OR floki OR pepe OR rocket OR moon)(from:{username}) lang:en until:2025-03-10 since:2022-01-01'
 CSV_FILE_PATH = 'tweets_{username}.csv'  # Dynamic CSV file path
+COLUMNAR_FILE_PATHS = {'parquet': 'tweets_{username}.parquet', 'feather': 'tweets_{username}.feather'}
 
-# Make client a global variable
+# One authenticated client shared by every fetch on the event loop, created on first use
 client = None
+client_lock = None
 
-async def get_tweets(client, tweets, max_retries=3):
+# Fetches for the same user write the same file, so they take turns
+user_locks = {}
+
+async def get_client():
+    """The shared twikit client, loading cookies or logging in the first time it is needed"""
+    global client, client_lock
+    
+    if client_lock is None:
+        client_lock = asyncio.Lock()
+    
+    async with client_lock:
+        if client is None:
+            # authenticate to X.com with increased timeout
+            new_client = Client(language='en-US', timeout=60.0)  # Increase timeout to 60 seconds
+            
+            # Try to use cookies first
+            try:
+                logger.info("Attempting to load cookies...")
+                new_client.load_cookies('cookies.json')
+            except Exception as e:
+                logger.warning(f"Failed to load cookies: {e}. Attempting login...")
+                
+                # login credentials
+                config = ConfigParser()
+                config.read('config.ini')
+                await new_client.login(auth_info_1=config['X']['username'], auth_info_2=config['X']['email'],
+                                       password=config['X']['password'])
+                new_client.save_cookies('cookies.json')
+            
+            client = new_client
+    
+    return client
+
+async def get_tweets(client, tweets, query, max_retries=3):
     retries = 0
     while retries < max_retries:
         try:
             if tweets is None:
                 logger.info("Getting initial tweets...")
-                tweets = await client.search_tweet(QUERY, product='Top')
+                tweets = await client.search_tweet(query, product='Top')
             else:
                 wait_time = randint(5, 10)
                 logger.info(f"Getting next tweets after {wait_time} seconds...")
@@ -45,43 +81,52 @@ async def get_tweets(client, tweets, max_retries=3):
     logger.error(f"Failed after {max_retries} retries")
     return None
 
-async def fetch_tweets_for_user(username):
-    global QUERY, CSV_FILE_PATH, client
+def write_columnar(tweets, file_path, output_format):
+    """Write scraped Tweet records to a Parquet or Feather (Arrow IPC) file in one go"""
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
     
-    # Update QUERY and CSV_FILE_PATH with the provided username
-    QUERY = QUERY.format(username=username)
-    CSV_FILE_PATH = CSV_FILE_PATH.format(username=username)
+    table = to_arrow_table(tweets)
+    if output_format == 'parquet':
+        pq.write_table(table, file_path)
+    else:
+        # Uncompressed so the analyzer can memory-map it without decoding
+        feather.write_feather(table, file_path, compression='uncompressed')
+
+async def fetch_tweets_for_user(username, output_format='csv'):
+    if output_format != 'csv' and output_format not in COLUMNAR_FILE_PATHS:
+        raise ValueError(f"Unsupported output format '{output_format}'")
     
-    try:
-        # login credentials
-        config = ConfigParser()
-        config.read('config.ini')
-        username_config = config['X']['username']
-        email = config['X']['email']
-        password = config['X']['password']
+    lock = user_locks.setdefault(username, asyncio.Lock())
+    async with lock:
+        return await scrape_tweets(username, output_format)
 
-        with open(CSV_FILE_PATH, 'w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            writer.writerow(['Tweet_count', 'Username', 'Text', 'Created At', 'Retweets', 'Likes'])
+async def scrape_tweets(username, output_format):
+    # The templates stay untouched so every call builds its own query and path
+    query = QUERY.format(username=username)
+    csv_file_path = CSV_FILE_PATH.format(username=username)
+    
+    # Columnar formats are written once the scrape is done
+    if output_format != 'csv':
+        output_path = COLUMNAR_FILE_PATHS[output_format].format(username=username)
+        columnar_tweets = []
+    else:
+        output_path = csv_file_path
+    
+    try:
+        if output_format == 'csv':
+            with open(csv_file_path, 'w', newline='', encoding='utf-8') as file:
+                writer = csv.writer(file)
+                writer.writerow(TWEET_COLUMNS)
 
-        # authenticate to X.com with increased timeout
-        client = Client(language='en-US', timeout=60.0)  # Increase timeout to 60 seconds
-        
-        # Try to use cookies first
-        try:
-            logger.info("Attempting to load cookies...")
-            client.load_cookies('cookies.json')
-        except Exception as e:
-            logger.warning(f"Failed to load cookies: {e}. Attempting login...")
-            await client.login(auth_info_1=username_config, auth_info_2=email, password=password)
-            client.save_cookies('cookies.json')
+        client = await get_client()
 
         tweet_count = 0
         tweets = None
 
         while tweet_count < MINIMUM_TWEETS:
             try:
-                tweets = await get_tweets(client, tweets)
+                tweets = await get_tweets(client, tweets, query)
                 
                 if not tweets:
                     logger.info("No more tweets found")
@@ -89,11 +134,14 @@ async def fetch_tweets_for_user(username):
 
                 for tweet in tweets:
                     tweet_count += 1
-                    tweet_data = [tweet_count, tweet.user.name, tweet.text, tweet.created_at, tweet.retweet_count, tweet.favorite_count]
+                    tweet_data = Tweet.from_twikit(tweet_count, tweet)
                     
-                    with open(CSV_FILE_PATH, 'a', newline='', encoding='utf-8') as file:
-                        writer = csv.writer(file)
-                        writer.writerow(tweet_data)
+                    if output_format == 'csv':
+                        with open(csv_file_path, 'a', newline='', encoding='utf-8') as file:
+                            writer = csv.writer(file)
+                            writer.writerow(tweet_data.as_row())
+                    else:
+                        columnar_tweets.append(tweet_data)
 
                 logger.info(f"Got {tweet_count} tweets so far")
                 
@@ -108,8 +156,11 @@ async def fetch_tweets_for_user(username):
                 await asyncio.sleep(30)  # Wait 30 seconds before retrying
                 continue
 
+        if output_format != 'csv':
+            write_columnar(columnar_tweets, output_path, output_format)
+        
         logger.info(f"Done! Got {tweet_count} tweets")
-        return CSV_FILE_PATH
+        return output_path
         
     except Exception as e:
         logger.error(f"Fatal error: {e}")
@@ -0,0 +1,98 @@
+# aiagent/phrases.py
+import numpy as np
+import pandas as pd
+from sketches import hash_words
+
+class PhraseCounter:
+    """
+    Bigram and trigram counts in fixed memory. Each n-gram is hashed to one of
+    num_buckets ids per length and the first phrase seen in a bucket owns it, so
+    memory doesn't grow with the number of distinct phrases. A second fingerprint from
+    the hash bits the bucket id doesn't use keeps colliding phrases out of the owner's
+    count: they go uncounted rather than inflate it.
+    """
+
+    def __init__(self, num_buckets=1 << 18, max_n=3):
+        self.num_buckets = num_buckets
+        self.sizes = range(2, max_n + 1)
+        self.counts = {n: np.zeros(num_buckets, dtype=np.int32) for n in self.sizes}
+        self.labels = {n: np.full(num_buckets, None, dtype=object) for n in self.sizes}
+        self.fingerprints = {n: np.zeros(num_buckets, dtype=np.uint32) for n in self.sizes}
+
+    def add_tokens(self, token_lists, weights=None):
+        """
+        Count the n-grams within each token list of an iterable. Weights scale each list's
+        counts; weighted totals are rounded to whole mentions.
+        """
+        token_lists = list(token_lists)
+        lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+        tokens = np.array([token for tokens in token_lists for token in tokens], dtype=object)
+        if len(tokens) == 0:
+            return
+        word_hashes = hash_words(tokens)
+        rows = np.repeat(np.arange(len(token_lists)), lengths)
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64)
+
+        hashes = word_hashes
+        for n in self.sizes:
+            # An n-gram starts at every position whose n-th word is in the same tweet
+            starts = np.arange(len(tokens) - n + 1)
+            hashes = hashes[:len(starts)] * np.uint64(1000003) ^ word_hashes[n - 1:]
+            starts = starts[rows[starts] == rows[starts + n - 1]]
+            ngram_hashes = hashes[starts]
+            ids = (ngram_hashes % np.uint64(self.num_buckets)).astype(np.int64)
+            fingerprints = (ngram_hashes >> np.uint64(32)).astype(np.uint32)
+
+            # Buckets seen for the first time belong to the phrase that filled them
+            labels = self.labels[n]
+            new_ids, first = np.unique(ids, return_index=True)
+            unlabeled = pd.isna(labels[new_ids])
+            self.fingerprints[n][new_ids[unlabeled]] = fingerprints[first[unlabeled]]
+            for bucket, start in zip(new_ids[unlabeled], starts[first[unlabeled]]):
+                labels[bucket] = ' '.join(tokens[start:start + n])
+
+            # Only the owning phrase is counted in a bucket
+            owned = self.fingerprints[n][ids] == fingerprints
+            if weights is None:
+                self.counts[n] += np.bincount(ids[owned], minlength=self.num_buckets).astype(np.int32)
+            else:
+                counts = np.bincount(ids[owned], weights=weights[rows[starts[owned]]], minlength=self.num_buckets)
+                self.counts[n] += np.rint(counts).astype(np.int32)
+
+    def top_phrases(self, vocabulary, min_count=3, top_n=20):
+        """
+        Phrases seen at least min_count times, ranked by pointwise mutual information:
+        how much more often their words occur together than apart
+        """
+        words = pd.Index(vocabulary.words, dtype=object)
+        word_counts = vocabulary.counts
+        total_words = word_counts.sum()
+        if total_words == 0:
+            return []
+
+        phrases, counts, scores = [], [], []
+        for n in self.sizes:
+            buckets = np.flatnonzero(self.counts[n] >= min_count)
+            if len(buckets) == 0:
+                continue
+            labels = self.labels[n][buckets]
+            parts = words.get_indexer([word for label in labels for word in label.split(' ')]).reshape(-1, n)
+            bucket_counts = self.counts[n][buckets]
+
+            # log2(P(phrase) / product of P(word)); words dropped since counting can't score
+            known = (parts >= 0).all(axis=1)
+            phrase_probability = bucket_counts[known] / self.counts[n].sum()
+            word_probabilities = word_counts[parts[known]] / total_words
+            phrases.extend(labels[known])
+            counts.append(bucket_counts[known])
+            scores.append(np.log2(phrase_probability) - np.log2(word_probabilities).sum(axis=1))
+
+        if not phrases:
+            return []
+        counts = np.concatenate(counts)
+        scores = np.concatenate(scores)
+        order = np.lexsort((-counts, -scores))[:top_n]
+
+        return [{"phrase": phrases[i], "count": int(counts[i]), "pmi": round(float(scores[i]), 4)}
+                for i in order]
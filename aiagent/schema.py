@@ -0,0 +1,93 @@
+# aiagent/schema.py
+import pandas as pd
+
+# Column order of every tweet file the scraper writes
+TWEET_COLUMNS = ['Tweet_count', 'Username', 'Text', 'Created At', 'Retweets', 'Likes']
+
+# Compact dtypes for loaded tweets; 'Created At' holds seconds since the epoch (UTC)
+TWEET_DTYPES = {
+    'Tweet_count': 'int32',
+    'Username': 'category',
+    'Created At': 'int64',
+    'Retweets': 'int32',
+    'Likes': 'int32'
+}
+
+# Format of twikit's Tweet.created_at, found in files written before timestamps were integers
+TWITTER_DATE_FORMAT = '%a %b %d %H:%M:%S %z %Y'
+
+class Tweet:
+    """A single scraped tweet on its way from the scraper to a tweet file"""
+    __slots__ = ('tweet_count', 'username', 'text', 'created_at', 'retweets', 'likes')
+
+    def __init__(self, tweet_count, username, text, created_at, retweets, likes):
+        self.tweet_count = tweet_count
+        self.username = username
+        self.text = text
+        self.created_at = created_at
+        self.retweets = retweets
+        self.likes = likes
+
+    @classmethod
+    def from_twikit(cls, tweet_count, tweet):
+        """Build a record from a twikit Tweet"""
+        return cls(tweet_count, tweet.user.name, tweet.text, int(tweet.created_at_datetime.timestamp()),
+                   tweet.retweet_count, tweet.favorite_count)
+
+    def as_row(self):
+        """Values in TWEET_COLUMNS order"""
+        return [self.tweet_count, self.username, self.text, self.created_at, self.retweets, self.likes]
+
+def to_arrow_table(tweets):
+    """Build a pyarrow Table with the schema dtypes from a list of Tweet records"""
+    import pyarrow as pa
+
+    return pa.table({
+        'Tweet_count': pa.array([tweet.tweet_count for tweet in tweets], pa.int32()),
+        'Username': pa.array([tweet.username for tweet in tweets], pa.string()).dictionary_encode(),
+        'Text': pa.array([tweet.text for tweet in tweets], pa.string()),
+        'Created At': pa.array([tweet.created_at for tweet in tweets], pa.int64()),
+        'Retweets': pa.array([tweet.retweets for tweet in tweets], pa.int32()),
+        'Likes': pa.array([tweet.likes for tweet in tweets], pa.int32())
+    })
+
+def coerce_tweets(frame):
+    """
+    Cast a loaded tweet frame to the schema dtypes. Twitter-formatted dates from older
+    files become epoch seconds; columns that don't fit their dtype are left as they are.
+    """
+    if 'Created At' in frame.columns and not pd.api.types.is_integer_dtype(frame['Created At']):
+        try:
+            dates = pd.to_datetime(frame['Created At'], format=TWITTER_DATE_FORMAT, utc=True)
+            frame['Created At'] = epoch_seconds(dates)
+        except (ValueError, TypeError):
+            pass
+
+    for column, dtype in TWEET_DTYPES.items():
+        if column in frame.columns:
+            try:
+                frame[column] = frame[column].astype(dtype)
+            except (ValueError, TypeError):
+                # Missing values can't be int64; the nullable Int64 keeps the rest as integers
+                if dtype == 'int64':
+                    try:
+                        frame[column] = frame[column].astype('Int64')
+                    except (ValueError, TypeError):
+                        pass
+
+    return frame
+
+def tweet_dates(created_at):
+    """
+    Parse a 'Created At' column to UTC datetimes. Any numeric column holds epoch seconds,
+    including float columns where missing dates are NaN.
+    """
+    if pd.api.types.is_numeric_dtype(created_at):
+        return pd.to_datetime(created_at, unit='s', utc=True)
+    return pd.to_datetime(created_at)
+
+def epoch_seconds(dates):
+    """Seconds since the epoch for a datetime column; naive datetimes are taken as UTC"""
+    if dates.dt.tz is None:
+        dates = dates.dt.tz_localize('UTC')
+    return (dates - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1)
@@ -0,0 +1,255 @@
+# aiagent/sketches.py
+import math
+from itertools import chain
+import numpy as np
+import pandas as pd
+
+def hash_words(words):
+    """Stable 64-bit hashes for an array of words"""
+    return pd.util.hash_array(np.asarray(words, dtype=object))
+
+class CountMinSketch:
+    """
+    Word frequencies in fixed memory. Estimates never undercount and overcount by at
+    most error * total mentions with the given confidence.
+    """
+
+    def __init__(self, error=0.0001, confidence=0.99, seed=0):
+        self.width = math.ceil(math.e / error)
+        self.depth = math.ceil(math.log(1 / (1 - confidence)))
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.total = 0
+
+        # One odd multiplier per row for multiply-shift hashing
+        rng = np.random.default_rng(seed)
+        self.multipliers = rng.integers(1, 2 ** 63, size=self.depth, dtype=np.uint64) | np.uint64(1)
+
+    def _columns(self, words):
+        """Column of every word in every row, shape (depth, len(words))"""
+        hashes = hash_words(words)
+        return ((hashes[None, :] * self.multipliers[:, None]) >> np.uint64(32)) % np.uint64(self.width)
+
+    def add(self, words, counts):
+        """Add counts for an array of distinct words"""
+        counts = np.asarray(counts, dtype=np.int64)
+        for row, columns in enumerate(self._columns(words)):
+            self.table[row] += np.bincount(columns, weights=counts, minlength=self.width).astype(np.int64)
+        self.total += int(counts.sum())
+
+    def estimate(self, words):
+        """Estimated count of each word"""
+        if len(words) == 0:
+            return np.empty(0, dtype=np.int64)
+        columns = self._columns(words)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def merge(self, other):
+        """Fold in a sketch built with the same error, confidence and seed"""
+        self.table += other.table
+        self.total += other.total
+
+class SpaceSaving:
+    """
+    The most frequent words in fixed memory. Every kept count overestimates the true
+    count by at most its recorded error, and any word with more than total / capacity
+    mentions is kept.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.words = np.empty(0, dtype=object)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.errors = np.empty(0, dtype=np.int64)
+
+    def add(self, words, counts):
+        """Add counts for an array of distinct words"""
+        words = np.asarray(words, dtype=object)
+        counts = np.asarray(counts, dtype=np.int64)
+
+        # Words that are already tracked just add up
+        positions = pd.Index(self.words).get_indexer(words)
+        tracked = positions >= 0
+        merged_counts = self.counts.copy()
+        merged_counts[positions[tracked]] += counts[tracked]
+
+        # New words may have been evicted before, so they start from the smallest kept count
+        floor = int(self.counts.min()) if len(self.counts) >= self.capacity else 0
+        new = ~tracked
+        all_words = np.concatenate([self.words, words[new]])
+        all_counts = np.concatenate([merged_counts, counts[new] + floor])
+        all_errors = np.concatenate([self.errors, np.full(int(new.sum()), floor, dtype=np.int64)])
+
+        # Keep the largest counts, earlier entries winning ties, in their original order
+        if len(all_words) > self.capacity:
+            keep = np.sort(np.lexsort((np.arange(len(all_counts)), -all_counts))[:self.capacity])
+            all_words, all_counts, all_errors = all_words[keep], all_counts[keep], all_errors[keep]
+
+        self.words, self.counts, self.errors = all_words, all_counts, all_errors
+
+class ApproximateCounter:
+    """Count-Min Sketch frequencies with SpaceSaving picking the candidate top words"""
+
+    def __init__(self, error=0.0001, confidence=0.99, capacity=1000):
+        self.sketch = CountMinSketch(error, confidence)
+        self.top_words = SpaceSaving(capacity)
+
+    def add_tokens(self, token_lists):
+        """Count every token in an iterable of token lists"""
+        tokens = np.array(list(chain.from_iterable(token_lists)), dtype=object)
+        codes, uniques = pd.factorize(tokens)
+        counts = np.bincount(codes, minlength=len(uniques))
+        self.sketch.add(uniques, counts)
+        self.top_words.add(uniques, counts)
+
+    def candidates(self):
+        """Candidate words with the tighter of the two upper-bound estimates"""
+        words = self.top_words.words
+        return words, np.minimum(self.top_words.counts, self.sketch.estimate(words))
+
+class TokenAuthorSketch:
+    """
+    Distinct authors per word. A word keeps the exact hashes of its authors until it has
+    more than sparse_limit of them, then moves to a HyperLogLog row of a register matrix,
+    so the long tail of rare words costs a few hashes instead of a full row each.
+    Sketches merge by taking register-wise maxima, so shards and time buckets combine
+    without rereading tweets.
+    """
+
+    def __init__(self, precision=8, sparse_limit=None):
+        self.precision = precision
+        self.num_registers = 1 << precision
+
+        # A word's hashes take 16 bytes each as (word, hash) pairs, so by default it moves
+        # to its register row once its hashes would outgrow it
+        self.sparse_limit = self.num_registers // 16 if sparse_limit is None else sparse_limit
+
+        # Register row of every word id, -1 while the word is sparse
+        self.ids = {}
+        self.dense_rows = np.full(1024, -1, dtype=np.int64)
+        self.registers = np.zeros((64, self.num_registers), dtype=np.uint8)
+        self.num_dense = 0
+
+        # Distinct (word id, author hash) pairs of sparse words, sorted by word then hash
+        self.sparse_ids = np.empty(0, dtype=np.int64)
+        self.sparse_hashes = np.empty(0, dtype=np.uint64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _word_ids(self, words):
+        """Id of every word, adding ids for unseen words"""
+        ids = self.ids
+        word_ids = np.array([ids.setdefault(word, len(ids)) for word in words], dtype=np.int64)
+        if len(ids) > len(self.dense_rows):
+            grown = np.full(max(len(ids), 2 * len(self.dense_rows)), -1, dtype=np.int64)
+            grown[:len(self.dense_rows)] = self.dense_rows
+            self.dense_rows = grown
+        return word_ids
+
+    def _ranks(self, hashes):
+        """Register of each hash from its top bits, and the rank of the first set bit after them"""
+        registers = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        remaining = ((hashes << np.uint64(self.precision)) >> np.uint64(32)).astype(np.float64)
+        _, exponents = np.frexp(remaining)
+        ranks = np.where(remaining > 0, 33 - exponents, 33).astype(np.uint8)
+        return registers, ranks
+
+    def _add_dense(self, rows, hashes):
+        """Fold author hashes into the register rows they belong to"""
+        registers, ranks = self._ranks(hashes)
+        np.maximum.at(self.registers, (rows, registers), ranks)
+
+    def _promote(self, word_ids):
+        """Give sparse words register rows and move their hashes into them"""
+        rows = np.arange(self.num_dense, self.num_dense + len(word_ids))
+        self.num_dense += len(word_ids)
+        if self.num_dense > len(self.registers):
+            grown = np.zeros((max(self.num_dense, 2 * len(self.registers)), self.num_registers), dtype=np.uint8)
+            grown[:len(self.registers)] = self.registers
+            self.registers = grown
+        self.dense_rows[word_ids] = rows
+
+        moving = np.isin(self.sparse_ids, word_ids)
+        self._add_dense(self.dense_rows[self.sparse_ids[moving]], self.sparse_hashes[moving])
+        self.sparse_ids = self.sparse_ids[~moving]
+        self.sparse_hashes = self.sparse_hashes[~moving]
+
+    def _add_hashes(self, word_ids, hashes):
+        """Record author hashes for word ids, promoting words that pass the sparse limit"""
+        rows = self.dense_rows[word_ids]
+        dense = rows >= 0
+        if dense.any():
+            self._add_dense(rows[dense], hashes[dense])
+        if dense.all():
+            return
+
+        # Merge the new pairs into the sorted sparse ones, dropping repeats
+        word_ids = np.concatenate([self.sparse_ids, word_ids[~dense]])
+        hashes = np.concatenate([self.sparse_hashes, hashes[~dense]])
+        order = np.lexsort((hashes, word_ids))
+        word_ids, hashes = word_ids[order], hashes[order]
+        distinct = np.ones(len(word_ids), dtype=bool)
+        distinct[1:] = (word_ids[1:] != word_ids[:-1]) | (hashes[1:] != hashes[:-1])
+        self.sparse_ids, self.sparse_hashes = word_ids[distinct], hashes[distinct]
+
+        counts = np.bincount(self.sparse_ids)
+        crowded = np.flatnonzero(counts > self.sparse_limit)
+        if len(crowded):
+            self._promote(crowded)
+
+    def add(self, words, authors):
+        """Record each (word, author) pair from aligned arrays"""
+        if len(words) == 0:
+            return
+        self._add_hashes(self._word_ids(words), hash_words(authors))
+
+    def merge(self, other):
+        """Fold in another sketch with the same precision"""
+        word_ids = self._word_ids(list(other.ids))
+        other_ids = np.fromiter(other.ids.values(), dtype=np.int64, count=len(word_ids))
+
+        # Words dense in the other sketch need rows here before registers can combine
+        other_rows = other.dense_rows[other_ids]
+        dense = other_rows >= 0
+        sparse_here = dense & (self.dense_rows[word_ids] < 0)
+        if sparse_here.any():
+            self._promote(word_ids[sparse_here])
+        rows = self.dense_rows[word_ids[dense]]
+        self.registers[rows] = np.maximum(self.registers[rows], other.registers[other_rows[dense]])
+
+        # Map the other sketch's word ids to ours through a lookup table
+        lookup = np.full(len(other.dense_rows), -1, dtype=np.int64)
+        lookup[other_ids] = word_ids
+        if len(other.sparse_ids):
+            self._add_hashes(lookup[other.sparse_ids], other.sparse_hashes)
+
+    def estimate(self, words):
+        """Estimated number of distinct authors for each word; 0 for unseen words"""
+        m = self.num_registers
+        word_ids = np.array([self.ids.get(word, -1) for word in words], dtype=np.int64)
+        estimates = np.zeros(len(word_ids), dtype=np.float64)
+        seen = word_ids >= 0
+        if not seen.any():
+            return estimates
+
+        # Sparse words are counted exactly
+        exact = np.bincount(self.sparse_ids, minlength=len(self.dense_rows))
+        estimates[seen] = exact[word_ids[seen]]
+
+        rows = np.full(len(word_ids), -1, dtype=np.int64)
+        rows[seen] = self.dense_rows[word_ids[seen]]
+        dense = rows >= 0
+        if not dense.any():
+            return estimates
+
+        registers = self.registers[rows[dense]]
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        raw = alpha * m * m / np.exp2(-registers.astype(np.float64)).sum(axis=1)
+
+        # Linear counting is more accurate while many registers are still empty
+        zeros = (registers == 0).sum(axis=1)
+        small = (raw <= 2.5 * m) & (zeros > 0)
+        raw[small] = m * np.log(m / zeros[small])
+
+        estimates[dense] = raw
+        return estimates
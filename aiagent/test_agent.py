@@ -0,0 +1,186 @@
+# aiagent/test_agent.py
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import pytest
+import agent
+from agent import CelebrityCryptoAnalyzer, Vocabulary, top_ids
+from cache import ReportCache
+from schema import coerce_tweets
+
+def tweets(dates, texts):
+    return coerce_tweets(pd.DataFrame({
+        'Username': ['elonmusk'] * len(texts),
+        'Text': texts,
+        'Created At': dates,
+        'Likes': range(len(texts)),
+        'Retweets': range(len(texts))
+    }))
+
+@pytest.fixture
+def analyzer():
+    try:
+        return CelebrityCryptoAnalyzer(report_cache=None, model_cache_dir=None)
+    except LookupError as e:
+        pytest.skip(str(e))
+
+@pytest.mark.filterwarnings('ignore:Could not infer format')
+def test_unparseable_batch_only_skips_its_own_dates(analyzer, tmp_path):
+    analyzer.data = tweets(['garbage', 'nonsense'], ['doge moon', 'doge rocket'])
+    report = analyzer.generate_incremental_report('elonmusk', str(tmp_path))
+    assert 'error' in report['monthly_trends']
+
+    analyzer.data = tweets(['Mon Mar 04 10:00:00 +0000 2024'], ['doge pump'])
+    report = analyzer.generate_incremental_report('elonmusk', str(tmp_path))
+    assert list(report['monthly_trends']) == ['2024-03']
+    assert report['total_tweets_analyzed'] == 3
+
+def test_seen_tweets_are_skipped_and_state_left_alone(analyzer, tmp_path):
+    batch = tweets(['Mon Mar 04 10:00:00 +0000 2024', 'Tue Mar 05 10:00:00 +0000 2024'],
+                   ['doge moon', 'pepe frog'])
+    analyzer.data = batch
+    analyzer.generate_incremental_report('elonmusk', str(tmp_path))
+    state_path = tmp_path / 'elonmusk.pkl'
+    modified = os.path.getmtime(state_path)
+
+    report = analyzer.generate_incremental_report('elonmusk', str(tmp_path))
+    assert report['total_tweets_analyzed'] == 2
+    assert os.path.getmtime(state_path) == modified
+
+    analyzer.data = pd.concat([batch, tweets(['Wed Mar 06 10:00:00 +0000 2024'], ['wif hat'])], ignore_index=True)
+    report = analyzer.generate_incremental_report('elonmusk', str(tmp_path))
+    assert report['total_tweets_analyzed'] == 3
+    assert analyzer._load_trend_state(str(state_path))['seen'].tolist() == sorted(analyzer._tweet_keys(analyzer.data))
+
+def test_worker_processes_count_like_the_serial_path():
+    try:
+        serial = CelebrityCryptoAnalyzer(tokenizer='nltk', report_cache=None)
+        parallel = CelebrityCryptoAnalyzer(tokenizer='nltk', workers=2, report_cache=None)
+    except LookupError as e:
+        pytest.skip(str(e))
+    texts = ['doge to the moon', 'pepe cannot stop', 'doge gonna pump', 'wif hat doge'] * 50
+    serial.data = parallel.data = tweets(['Mon Mar 04 10:00:00 +0000 2024'] * len(texts), texts)
+
+    assert parallel.extract_trending_words(top_n=10) == serial.extract_trending_words(top_n=10)
+
+def test_incremental_report_is_cached_until_the_state_changes(tmp_path):
+    try:
+        analyzer = CelebrityCryptoAnalyzer(report_cache=ReportCache(), model_cache_dir=None)
+    except LookupError as e:
+        pytest.skip(str(e))
+    batch = tweets(['Mon Mar 04 10:00:00 +0000 2024'], ['doge moon'])
+    analyzer.data = batch
+    first = analyzer.generate_incremental_report('elonmusk', str(tmp_path))
+    first['topics'].append('changed by the caller')
+    assert analyzer.generate_incremental_report('elonmusk', str(tmp_path)) != first
+    assert len(analyzer.report_cache) == 1
+
+    analyzer.data = pd.concat([batch, tweets(['Tue Mar 05 10:00:00 +0000 2024'], ['pepe frog'])], ignore_index=True)
+    assert analyzer.generate_incremental_report('elonmusk', str(tmp_path))['total_tweets_analyzed'] == 2
+
+def test_concurrent_incremental_reports_share_the_state_safely(analyzer, tmp_path):
+    texts = [f"doge moon {i}" for i in range(40)]
+    analyzer.data = tweets(['Mon Mar 04 10:00:00 +0000 2024'] * len(texts), texts)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        reports = list(pool.map(lambda _: analyzer.generate_incremental_report('elon', str(tmp_path)), range(40)))
+
+    assert all(report['total_tweets_analyzed'] == len(texts) for report in reports)
+    assert [path.name for path in tmp_path.iterdir()] == ['elon.pkl']
+
+def test_damaged_state_is_rebuilt(analyzer, tmp_path):
+    analyzer.data = tweets(['Mon Mar 04 10:00:00 +0000 2024'], ['doge moon'])
+    analyzer.generate_incremental_report('elon', str(tmp_path))
+    state_path = tmp_path / 'elon.pkl'
+    state_path.write_bytes(state_path.read_bytes()[:len(state_path.read_bytes()) // 2] + b'\xff' * 64)
+
+    assert analyzer.generate_incremental_report('elon', str(tmp_path))['total_tweets_analyzed'] == 1
+
+def test_state_from_another_tokenizer_is_rebuilt(analyzer, tmp_path):
+    analyzer.data = tweets(['Mon Mar 04 10:00:00 +0000 2024'], ['doge moon'])
+    analyzer.generate_incremental_report('elon', str(tmp_path))
+
+    other = CelebrityCryptoAnalyzer(tokenizer='nltk', report_cache=None, model_cache_dir=None)
+    other.data = tweets(['Tue Mar 05 10:00:00 +0000 2024'], ['pepe frog'])
+    assert other._load_trend_state(str(tmp_path / 'elon.pkl'))['engine'].rows_seen == 0
+    assert other.generate_incremental_report('elon', str(tmp_path))['total_tweets_analyzed'] == 1
+
+def test_directly_assigned_data_never_borrows_cached_topics(tmp_path):
+    try:
+        analyzer = CelebrityCryptoAnalyzer(report_cache=None, model_cache_dir=str(tmp_path))
+    except LookupError as e:
+        pytest.skip(str(e))
+    analyzer.data = tweets(['Mon Mar 04 10:00:00 +0000 2024'] * 40, ['doge lambo rocket shib'] * 40)
+    analyzer.generate_memecoin_trends_report()
+
+    analyzer.data = tweets(['Mon Mar 04 10:00:00 +0000 2024'] * 40, ['pepe frog wojak chad'] * 40)
+    terms = {term for topic in analyzer.generate_memecoin_trends_report()['topics'] for term in topic['top_terms']}
+    assert terms <= {'pepe', 'frog', 'wojak', 'chad'}
+    assert list(tmp_path.iterdir()) == []
+
+@pytest.mark.filterwarnings('ignore:Could not infer format')
+def test_unparseable_chunk_only_skips_its_own_dates(analyzer, tmp_path):
+    path = tmp_path / 'tweets.csv'
+    pd.DataFrame({
+        'Username': ['elonmusk'] * 4,
+        'Text': ['doge moon', 'doge rocket', 'doge pump', 'doge lambo'],
+        'Created At': ['garbage', 'nonsense', 'Mon Mar 04 10:00:00 +0000 2024', 'Tue Apr 02 10:00:00 +0000 2024'],
+        'Likes': [1, 2, 3, 4],
+        'Retweets': [0, 0, 0, 0]
+    }).to_csv(path, index=False)
+
+    report = analyzer.stream_memecoin_trends_report(str(path), chunksize=2)
+    assert list(report['monthly_trends']) == ['2024-03', '2024-04']
+    assert report['total_tweets_analyzed'] == 4
+
+def test_report_counts_near_duplicates_like_trending_words():
+    try:
+        analyzer = CelebrityCryptoAnalyzer(duplicate_weight=0.0, report_cache=None, model_cache_dir=None)
+    except LookupError as e:
+        pytest.skip(str(e))
+    shill = "doge moon rocket lambo shib pump https://t.co/"
+    texts = [shill + str(i) for i in range(20)] + ['pepe frog', 'frog pepe wins', 'big frog energy pepe']
+    analyzer.data = tweets(['Mon Mar 04 10:00:00 +0000 2024'] * len(texts), texts)
+
+    report = analyzer.generate_memecoin_trends_report()
+    assert report['overall_trending_words'] == analyzer.extract_trending_words(min_count=3, top_n=30)
+    assert dict(report['overall_trending_words']).keys() >= {'pepe', 'frog'}
+    assert 'lambo' not in dict(report['overall_trending_words'])
+    assert report['total_tweets_analyzed'] == len(texts)
+
+def test_cached_report_is_stamped_when_served(monkeypatch):
+    try:
+        analyzer = CelebrityCryptoAnalyzer(report_cache=ReportCache(), model_cache_dir=None)
+    except LookupError as e:
+        pytest.skip(str(e))
+    analyzer.data = tweets(['Mon Mar 04 10:00:00 +0000 2024'] * 3, ['doge moon', 'doge pump', 'doge wif'])
+    first = analyzer.generate_memecoin_trends_report()
+
+    class Later(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2030, 1, 1, 12, 0, 0)
+
+    monkeypatch.setattr(agent, 'datetime', Later)
+    second = analyzer.generate_memecoin_trends_report()
+    assert second['report_generated_at'] == '2030-01-01 12:00:00'
+    assert {**second, 'report_generated_at': None} == {**first, 'report_generated_at': None}
+
+def test_vocabulary_assigns_ids_in_first_seen_order():
+    vocabulary = Vocabulary()
+    assert vocabulary.add_counts(['doge', 'moon'], [2, 1]).tolist() == [0, 1]
+    assert vocabulary.add_counts(['pepe', 'doge', 'wif'], [1, 1, 4]).tolist() == [2, 0, 3]
+    assert vocabulary.words == ['doge', 'moon', 'pepe', 'wif']
+    assert vocabulary.counts.tolist() == [3, 1, 1, 4]
+    assert vocabulary.lengths.tolist() == [4, 4, 4, 3]
+
+@pytest.mark.parametrize('top_n', [0, 1, 3, 7, 50])
+def test_top_ids_match_a_full_sort_with_ties(top_n):
+    rng = np.random.default_rng(top_n)
+    scores = rng.integers(0, 5, size=200).astype(np.float64)
+    candidates = np.flatnonzero(rng.random(200) < 0.7)
+
+    expected = sorted(candidates.tolist(), key=lambda i: (-scores[i], i))[:top_n]
+    assert top_ids(scores, candidates, top_n).tolist() == expected
+    assert top_ids(scores, candidates[:0], top_n).tolist() == []
@@ -0,0 +1,39 @@
+# aiagent/test_app.py
+import asyncio
+import importlib
+import os
+import subprocess
+import sys
+import pytest
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    # The scraper logs to a file in the working directory as soon as it is imported
+    monkeypatch.chdir(tmp_path)
+    return importlib.import_module('app')
+
+def test_event_loop_starts_once_per_process(app, monkeypatch):
+    loop = app.get_loop()
+    assert app.get_loop() is loop and loop.is_running()
+
+    # A forked worker sees another pid and starts its own loop
+    monkeypatch.setattr(app, 'loop_pid', os.getpid() + 1)
+    assert app.get_loop() is not loop
+
+def test_slow_scrape_returns_504(app, monkeypatch):
+    async def slow_fetch(username, output_format):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(app.main, 'fetch_tweets_for_user', slow_fetch)
+    monkeypatch.setattr(app, 'SCRAPE_TIMEOUT_SECONDS', 0.05)
+
+    response = app.app.test_client().get('/analyze?username=elonmusk')
+    assert response.status_code == 504
+
+def test_import_leaves_the_analyzer_cold_unless_asked(tmp_path):
+    code = "import sys, app; print(sorted({'nltk', 'scipy', 'sklearn'} & set(sys.modules)))"
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+    env.pop('WARM_UP', None)
+    result = subprocess.run([sys.executable, '-c', code], cwd=tmp_path, env=env,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.split('\n')[-2] == '[]'
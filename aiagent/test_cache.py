@@ -0,0 +1,22 @@
+# aiagent/test_cache.py
+from cache import ReportCache
+
+def test_values_are_copied_in_and_out():
+    cache = ReportCache()
+    report = {'words': [('doge', 3)]}
+    cache.put('key', report)
+    report['words'].append(('pepe', 2))
+
+    cached = cache.get('key')
+    cached['words'].clear()
+    assert cache.get('key') == {'words': [('doge', 3)]}
+
+def test_expired_and_evicted_entries_are_gone():
+    cache = ReportCache(max_entries=1, ttl_seconds=0)
+    cache.put('old', 1)
+    assert cache.get('old', 'missing') == 'missing'
+
+    cache = ReportCache(max_entries=1)
+    cache.put('old', 1)
+    cache.put('new', 2)
+    assert cache.get('old') is None and cache.get('new') == 2
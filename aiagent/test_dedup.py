@@ -0,0 +1,36 @@
+# aiagent/test_dedup.py
+import numpy as np
+import pandas as pd
+import pytest
+from dedup import NearDuplicateDetector
+
+SHILL = "huge news the next 100x gem is launching today get in early before it moons"
+
+def test_url_varied_and_edited_copies_cluster_together():
+    texts = [
+        SHILL + " https://t.co/aaa111",
+        SHILL + " https://t.co/bbb222",
+        SHILL.replace("huge", "HUGE") + "!!!",
+        SHILL.replace("today", "tonight") + " https://t.co/ccc333",
+        "just had a great coffee with the team this morning",
+        "completely unrelated thoughts about the weather in texas",
+    ]
+    clusters = NearDuplicateDetector().clusters(texts)
+    assert clusters.tolist() == [0, 0, 0, 0, 4, 5]
+
+def test_empty_input_has_no_clusters():
+    assert len(NearDuplicateDetector().clusters([])) == 0
+
+def test_cluster_weights_count_copies_at_duplicate_weight():
+    from agent import CelebrityCryptoAnalyzer
+    try:
+        analyzer = CelebrityCryptoAnalyzer(duplicate_weight=0.25, report_cache=None)
+    except LookupError as e:
+        pytest.skip(str(e))
+    texts = pd.Series([SHILL + " https://t.co/a", "gm frens", SHILL + " https://t.co/b",
+                       SHILL + " https://t.co/c", "gm frens"])
+
+    rows, weights = analyzer._deduplicate(texts)
+    assert rows.tolist() == [0, 1]
+    assert weights.tolist() == [1 + 0.25 * 2, 1 + 0.25 * 1]
+    assert analyzer._tweet_weights(texts).tolist() == [1.5, 1.25, 0, 0, 0]
@@ -0,0 +1,41 @@
+# aiagent/test_keywords.py
+import random
+from keywords import KeywordMatcher
+
+LEXICON = {'moon', 'diamond', 'hands', 'diamond hands', 'paper hands', 'to the moon',
+           'the moon', 'send it', 'it', 'buy the dip', 'the dip'}
+
+def naive_matches(lexicon, text):
+    """Every lexicon entry ending at each word, scanning all phrase positions"""
+    words = text.split()
+    found = []
+    for end in range(1, len(words) + 1):
+        for phrase in sorted(lexicon):
+            parts = phrase.split()
+            if end >= len(parts) and words[end - len(parts):end] == parts:
+                found.append(phrase)
+    return found
+
+def test_overlapping_phrases_are_all_found():
+    matcher = KeywordMatcher(LEXICON)
+    assert sorted(matcher.matches('diamond hands to the moon')) == sorted(
+        ['diamond', 'hands', 'diamond hands', 'moon', 'the moon', 'to the moon'])
+
+def test_phrase_that_is_a_suffix_of_another():
+    matcher = KeywordMatcher(LEXICON)
+    assert sorted(matcher.matches('buy the dip')) == ['buy the dip', 'the dip']
+    assert matcher.matches('sell the dip') == ['the dip']
+
+def test_failure_links_recover_after_a_partial_match():
+    matcher = KeywordMatcher(LEXICON)
+    assert sorted(matcher.matches('paper diamond hands send send it')) == sorted(
+        ['diamond', 'hands', 'diamond hands', 'send it', 'it'])
+    assert sorted(matcher.matches('to the to the moon')) == ['moon', 'the moon', 'to the moon']
+
+def test_matches_agree_with_a_naive_scan():
+    rng = random.Random(0)
+    vocabulary = ['to', 'the', 'moon', 'diamond', 'hands', 'paper', 'send', 'it', 'buy', 'dip', 'gm']
+    matcher = KeywordMatcher(LEXICON)
+    for _ in range(500):
+        text = ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(0, 12)))
+        assert sorted(matcher.matches(text)) == sorted(naive_matches(LEXICON, text))
@@ -0,0 +1,28 @@
+# aiagent/test_phrases.py
+import random
+from collections import Counter
+from agent import Vocabulary
+from phrases import PhraseCounter
+
+def test_colliding_phrases_never_inflate_counts():
+    rng = random.Random(3)
+    words = [f"w{i}" for i in range(60)]
+    token_lists = [rng.choices(words, k=8) for _ in range(3000)]
+
+    exact = Counter()
+    for tokens in token_lists:
+        for n in (2, 3):
+            exact.update(' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+
+    # Far fewer buckets than distinct phrases, so most buckets see collisions
+    counter = PhraseCounter(num_buckets=1 << 10)
+    counter.add_tokens(token_lists)
+    for n in counter.sizes:
+        for label, count in zip(counter.labels[n], counter.counts[n]):
+            if label is not None:
+                assert count == exact[label]
+
+    vocabulary = Vocabulary()
+    vocabulary.add_tokens(token_lists)
+    for phrase in counter.top_phrases(vocabulary, top_n=5):
+        assert phrase["count"] == exact[phrase["phrase"]]
@@ -0,0 +1,25 @@
+# aiagent/test_schema.py
+import numpy as np
+import pandas as pd
+from schema import coerce_tweets, epoch_seconds, tweet_dates
+
+def test_missing_twitter_date_leaves_other_dates_alone():
+    frame = coerce_tweets(pd.DataFrame({
+        'Created At': ['Mon Mar 04 10:00:00 +0000 2024', None, 'Sat Mar 05 10:00:00 +0000 2022'],
+        'Likes': [1, 2, 3]
+    }))
+
+    dates = tweet_dates(frame['Created At'])
+    assert dates[0] == pd.Timestamp('2024-03-04 10:00:00', tz='UTC')
+    assert pd.isna(dates[1])
+    assert dates[2] == pd.Timestamp('2022-03-05 10:00:00', tz='UTC')
+
+def test_float_epoch_seconds_are_seconds():
+    dates = tweet_dates(pd.Series([1709546400.0, np.nan]))
+    assert dates[0] == pd.Timestamp('2024-03-04 10:00:00', tz='UTC')
+    assert pd.isna(dates[1])
+
+def test_epoch_round_trip():
+    frame = coerce_tweets(pd.DataFrame({'Created At': ['Mon Mar 04 10:00:00 +0000 2024']}))
+    assert frame['Created At'].dtype == 'int64'
+    assert epoch_seconds(tweet_dates(frame['Created At'])).tolist() == [1709546400]
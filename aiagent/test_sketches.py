@@ -0,0 +1,98 @@
+# aiagent/test_sketches.py
+from collections import Counter
+import numpy as np
+import pandas as pd
+import pytest
+from sketches import CountMinSketch, SpaceSaving, TokenAuthorSketch
+
+def pairs(seed=0, rare_words=2000, common_authors=5000):
+    """A long tail of words with a handful of authors each and a few words with thousands"""
+    rng = np.random.default_rng(seed)
+    words = [f"rare{i}" for i in range(rare_words) for _ in range(3)]
+    authors = [f"user{a}" for a in rng.integers(0, 50, size=len(words))]
+    for word in ['doge', 'pepe']:
+        words += [word] * common_authors
+        authors += [f"user{a}" for a in range(common_authors)]
+    return np.array(words, dtype=object), np.array(authors, dtype=object)
+
+def test_rare_words_are_exact_and_stay_sparse():
+    words, authors = pairs()
+    sketch = TokenAuthorSketch()
+    sketch.add(words, authors)
+
+    rare = [f"rare{i}" for i in range(2000)]
+    expected = [len(set(authors[words == word])) for word in rare[:50]]
+    assert sketch.estimate(rare[:50]).tolist() == expected
+    assert sketch.num_dense == 2
+
+def test_common_words_are_estimated():
+    words, authors = pairs()
+    sketch = TokenAuthorSketch()
+    sketch.add(words, authors)
+    assert np.allclose(sketch.estimate(['doge', 'pepe']), 5000, rtol=0.15)
+    assert sketch.estimate(['unseen']).tolist() == [0.0]
+
+def test_merge_matches_a_single_sketch():
+    words, authors = pairs()
+    whole = TokenAuthorSketch()
+    whole.add(words, authors)
+
+    # Split unevenly so some words are dense on one side and sparse on the other
+    left, right = TokenAuthorSketch(), TokenAuthorSketch()
+    left.add(words[::7], authors[::7])
+    right.add(np.delete(words, np.s_[::7]), np.delete(authors, np.s_[::7]))
+    left.merge(right)
+
+    vocabulary = list(whole.ids)
+    assert np.array_equal(left.estimate(vocabulary), whole.estimate(vocabulary))
+
+def zipf_batches(seed=0, batches=5, size=20000, vocabulary=5000):
+    """Batches of Zipf-distributed words, so a few are heavy and most are rare"""
+    rng = np.random.default_rng(seed)
+    return [np.array([f"w{i}" for i in np.minimum(rng.zipf(1.3, size), vocabulary)], dtype=object)
+            for _ in range(batches)]
+
+def test_count_min_never_undercounts_and_stays_within_the_bound():
+    sketch = CountMinSketch(error=0.001, confidence=0.99)
+    true = Counter()
+    for batch in zipf_batches():
+        words, counts = np.unique(batch, return_counts=True)
+        sketch.add(words, counts)
+        true.update(batch.tolist())
+
+    words = list(true)
+    over = sketch.estimate(words) - np.array([true[word] for word in words])
+    assert sketch.total == sum(true.values())
+    assert (over >= 0).all()
+    assert (over > 0.001 * sketch.total).mean() <= 0.01
+
+def test_space_saving_keeps_every_heavy_word_across_batches():
+    counter = SpaceSaving(capacity=50)
+    true = Counter()
+    for batch in zipf_batches(seed=1):
+        words, counts = np.unique(batch, return_counts=True)
+        counter.add(words, counts)
+        true.update(batch.tolist())
+
+    total = sum(true.values())
+    kept = dict(zip(counter.words, zip(counter.counts.tolist(), counter.errors.tolist())))
+    assert {word for word, count in true.items() if count > total / 50} <= kept.keys()
+    for word, (count, error) in kept.items():
+        assert count - error <= true[word] <= count
+
+def test_verify_restores_exact_counts():
+    from agent import CelebrityCryptoAnalyzer
+    try:
+        analyzer = CelebrityCryptoAnalyzer(counting='approximate', sketch_error=0.01, heavy_hitters=40,
+                                           report_cache=None)
+    except LookupError as e:
+        pytest.skip(str(e))
+    batches = [[batch[i:i + 12].tolist() for i in range(0, len(batch), 12)] for batch in zipf_batches(seed=2)]
+    true = Counter(word for batch in batches for tokens in batch for word in tokens)
+
+    approximate = analyzer._approximate_vocabulary(batches)
+    verified = analyzer._approximate_vocabulary(batches, batches)
+    approximate_counts = dict(zip(approximate.words, approximate.counts.tolist()))
+    assert any(count > true[word] for word, count in approximate_counts.items())
+    assert all(count >= true[word] for word, count in approximate_counts.items())
+    assert dict(zip(verified.words, verified.counts.tolist())) == {word: true[word] for word in approximate_counts}
@@ -0,0 +1,27 @@
+# aiagent/test_tokenizer.py
+import pytest
+from agent import NLTK_RESOURCES, ensure_nltk_data, nltk_tokenize, regex_tokenize
+
+CASES = [
+    'check https://t.co/abc123 out',
+    'gm @elonmusk and @vitalik.eth',
+    'url straight after a mention @bobhttps://t.co/x',
+    '#doge to the #moon!!!',
+    'café déjà vu ñandú 🚀🚀 ¡vamos!',
+    'i cannot wait, gonna buy, wanna hold, gotta go, lemme see, gimme more',
+    "don't won't it's y'all",
+    '$pepe +420% in 24h... 10x?',
+    'tabs\tand\nnewlines   and  spaces',
+    '',
+]
+
+@pytest.fixture(scope='module', autouse=True)
+def nltk_data():
+    try:
+        ensure_nltk_data(NLTK_RESOURCES['nltk'])
+    except LookupError as e:
+        pytest.skip(str(e))
+
+@pytest.mark.parametrize('text', CASES)
+def test_regex_tokenizer_matches_nltk(text):
+    assert regex_tokenize(text.lower()) == nltk_tokenize(text.lower())
@@ -0,0 +1,49 @@
+# aiagent/test_topics.py
+import numpy as np
+from topics import TopicClusterer, TopicModelCache
+
+TWEETS = [['doge', 'moon'], ['pepe', 'frog'], ['doge', 'rocket'], ['pepe', 'meme']] * 8
+
+def test_summary_sizes_can_count_other_tweets():
+    clusterer = TopicClusterer(num_topics=2, batch_size=8)
+    clusterer.partial_fit(TWEETS)
+
+    labels = clusterer.predict(TWEETS[:4])
+    sizes = np.bincount(labels, minlength=2)
+    assert sum(topic['size'] for topic in clusterer.summary()) == len(TWEETS)
+    assert sum(topic['size'] for topic in clusterer.summary(sizes=sizes)) == 4
+
+def test_unusable_cache_entries_are_skipped(tmp_path):
+    cache = TopicModelCache(str(tmp_path))
+    keys = np.arange(4, dtype=np.uint64)
+    (tmp_path / f"src-{cache.fingerprint(keys)}.pkl").write_bytes(b'not a pickle')
+    (tmp_path / "src-other.pkl").write_bytes(b'')
+
+    clusterer, seen = cache.load('src', keys)
+    assert clusterer is None
+    assert len(seen) == 0
+
+def test_cached_model_round_trips(tmp_path):
+    cache = TopicModelCache(str(tmp_path))
+    keys = np.arange(4, dtype=np.uint64)
+    clusterer = TopicClusterer(num_topics=2, batch_size=8)
+    clusterer.partial_fit(TWEETS)
+    cache.save('src', keys, keys, clusterer)
+
+    loaded, seen = cache.load('src', keys)
+    assert loaded.fitted
+    assert seen.tolist() == keys.tolist()
+
+def test_only_overlapping_corpora_warm_start(tmp_path):
+    cache = TopicModelCache(str(tmp_path))
+    seen = np.arange(10, dtype=np.uint64)
+    clusterer = TopicClusterer(num_topics=2, batch_size=8)
+    clusterer.partial_fit(TWEETS)
+    cache.save('src', seen, seen, clusterer)
+
+    grown = np.arange(12, dtype=np.uint64)
+    assert cache.load('src', grown)[0] is not None
+
+    unrelated = np.arange(100, 110, dtype=np.uint64)
+    assert cache.load('src', unrelated)[0] is None
+    assert list(tmp_path.glob('*.tmp')) == []
@@ -0,0 +1,128 @@
+# aiagent/test_trends.py
+import math
+from collections import Counter
+import pandas as pd
+import pytest
+from trends import BurstDetector, DecayedCounter, PeriodCounter, TrendEngine, WindowCounter
+
+def epoch(date):
+    return pd.Timestamp(date, tz='UTC').timestamp()
+
+def test_same_month_of_different_years_stays_separate():
+    counter = PeriodCounter('month')
+    counter.update([['doge'], ['doge', 'pepe'], ['shib']],
+                   [epoch('2022-03-15'), epoch('2024-03-15'), epoch('2024-03-20')])
+    assert counter.top(10) == {'2022-03': [('doge', 1)], '2024-03': [('doge', 1), ('pepe', 1), ('shib', 1)]}
+
+@pytest.mark.parametrize('granularity, label', [
+    ('day', '2024-03-06'),
+    ('week', '2024-03-04/2024-03-10'),
+    ('month', '2024-03'),
+    ('year', '2024'),
+])
+def test_period_labels(granularity, label):
+    assert PeriodCounter(granularity).periods_of([epoch('2024-03-06 23:59'), float('nan')]).tolist() == [label, None]
+
+def test_top_words_per_period_break_ties_by_first_seen():
+    counter = PeriodCounter('year')
+    counter.update([['moon', 'doge'], ['pepe']], [epoch('2024-01-01'), epoch('2024-06-01')])
+    counter.update([['pepe', 'doge', 'moon'], ['lambo']], [epoch('2024-07-01'), epoch('2023-01-01')])
+    counter.update([['pepe']], [epoch('2024-12-31')])
+    assert counter.top(3) == {'2023': [('lambo', 1)], '2024': [('pepe', 3), ('moon', 2), ('doge', 2)]}
+    assert counter.top(2) == {'2023': [('lambo', 1)], '2024': [('pepe', 3), ('moon', 2)]}
+
+def test_unknown_granularity_is_rejected():
+    with pytest.raises(ValueError):
+        PeriodCounter('quarter')
+
+def test_window_expires_old_buckets_with_out_of_order_tweets():
+    window = WindowCounter(window_seconds=300, bucket_seconds=100)
+    window.add(1000, ['doge'])
+    window.add(1150, ['pepe'])
+    window.add(1050, ['doge'])
+    assert window.totals == Counter({'doge': 2, 'pepe': 1})
+
+    # Older than the window: dropped
+    window.add(600, ['shib'])
+    assert 'shib' not in window.totals
+
+    # Advancing two buckets expires the one holding both doge mentions
+    window.add(1320, ['moon'])
+    assert window.totals == Counter({'pepe': 1, 'moon': 1})
+
+    # A late tweet still inside the window lands in its own bucket
+    window.add(1210, ['pepe'])
+    assert window.totals == Counter({'pepe': 2, 'moon': 1})
+    assert [dict(bucket) for bucket in window.recent(3)] == [{'pepe': 1}, {'pepe': 1}, {'moon': 1}]
+
+    # A jump past the whole window empties it
+    window.add(5000, ['wif'])
+    assert window.totals == Counter({'wif': 1})
+
+def test_decayed_scores_survive_the_landmark_rescale():
+    counter = DecayedCounter(half_life_seconds=60)
+    counter.add(0, ['doge'])
+    counter.add(60, ['doge', 'pepe'])
+    assert counter.scores_at(60) == pytest.approx({'doge': 1.5, 'pepe': 1.0})
+
+    # exp(decay_rate * age) would pass e**500 here, so the landmark moves forward
+    later = 60 * 800
+    counter.add(later, ['doge'])
+    assert counter.landmark == later
+    assert counter.scores_at(later + 60) == pytest.approx({'doge': 0.5, 'pepe': 0.0}, abs=1e-12)
+
+def test_velocity_and_acceleration_signs():
+    engine = TrendEngine(windows={'3h': (3 * 3600, 3600)}, velocity_window='3h')
+    hour = 3600
+    for timestamp, tokens in [(0, ['doge'] * 1 + ['pepe'] * 5),
+                              (hour, ['doge'] * 2 + ['pepe'] * 3),
+                              (2 * hour, ['doge'] * 6 + ['pepe'] * 2)]:
+        engine.add(timestamp, tokens)
+
+    velocities = engine.velocities()
+    assert velocities['doge'] == (4, 3)
+    assert velocities['pepe'] == (-1, 1)
+    assert engine.snapshot()['velocity'][0]['word'] == 'doge'
+
+def test_analyzer_trend_windows_are_configurable():
+    from agent import CelebrityCryptoAnalyzer
+    try:
+        analyzer = CelebrityCryptoAnalyzer(trend_windows={'15m': (900, 60)}, trend_half_life=600,
+                                           velocity_window='15m', report_cache=None)
+    except LookupError as e:
+        pytest.skip(str(e))
+    engine = analyzer._report_accumulator().trends
+    assert list(engine.windows) == ['15m'] and engine.windows['15m'].num_buckets == 15
+    assert engine.decayed.decay_rate == pytest.approx(math.log(2) / 600)
+
+    with pytest.raises(ValueError):
+        CelebrityCryptoAnalyzer(trend_windows={'15m': (900, 60)})
+
+def test_spike_is_flagged_but_steady_chatter_is_not():
+    hour = 3600
+    tokens, timestamps = [], []
+    for bucket in range(48):
+        # 'gm' is said 20 times every hour; 'wif' twice an hour, except 30 times in hour 30
+        for _ in range(20):
+            tokens.append(['gm'])
+            timestamps.append(bucket * hour + 60)
+        for _ in range(30 if bucket == 30 else 2):
+            tokens.append(['wif'])
+            timestamps.append(bucket * hour + 120)
+    tokens.append(['undated'])
+    timestamps.append(float('nan'))
+
+    detector = BurstDetector(bucket_seconds=hour)
+    detector.update(tokens[:500], timestamps[:500])
+    detector.update(tokens[500:], timestamps[500:])
+
+    bursts = detector.detect()
+    assert [burst['word'] for burst in bursts] == ['wif']
+    assert bursts[0]['count'] == 30
+    assert bursts[0]['bucket_start'] == '1970-01-02 06:00:00'
+    assert bursts[0]['baseline'] == pytest.approx(2.0)
+
+def test_single_bucket_has_no_bursts():
+    detector = BurstDetector()
+    detector.update([['doge']] * 10, [0.0] * 10)
+    assert detector.detect() == []
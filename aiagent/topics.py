@@ -0,0 +1,190 @@
+# aiagent/topics.py
+import hashlib
+import os
+import pickle
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Bump when TopicClusterer changes so cached models are refitted instead of loaded
+MODEL_CACHE_VERSION = 1
+
+def identity(tokens):
+    """Analyzer for already tokenized tweets; module-level so fitted models pickle"""
+    return tokens
+
+class TopicClusterer:
+    """
+    Groups tweets into memecoin narratives with a stateless hashing vectorizer and
+    mini-batch k-means, one batch of tweets at a time
+    """
+
+    def __init__(self, num_topics=8, num_features=1 << 15, batch_size=1024, seed=0):
+        if batch_size < num_topics:
+            raise ValueError(f"batch_size ({batch_size}) must be at least num_topics ({num_topics})")
+
+        # scikit-learn is slow to import, so it is only loaded once topics are needed
+        from sklearn.cluster import MiniBatchKMeans
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.num_topics = num_topics
+        self.batch_size = batch_size
+        self.vectorizer = HashingVectorizer(analyzer=identity, n_features=num_features, alternate_sign=False)
+        self.model = MiniBatchKMeans(n_clusters=num_topics, batch_size=batch_size, n_init=1, random_state=seed)
+
+        # Tweets assigned to each topic, and the first word seen for each hashed feature
+        self.sizes = np.zeros(num_topics, dtype=np.int64)
+        self.feature_words = np.full(num_features, None, dtype=object)
+
+        # Vectors held back until there are enough tweets to initialise the centroids
+        self.pending = None
+
+    @property
+    def fitted(self):
+        return hasattr(self.model, 'cluster_centers_')
+
+    def partial_fit(self, token_lists):
+        """Update the centroids with a batch of tokenized tweets and count their topics"""
+        token_lists = [tokens for tokens in token_lists if tokens]
+        if not token_lists:
+            return
+        self._label_features(token_lists)
+
+        vectors = self.vectorizer.transform(token_lists)
+        if self.pending is not None:
+            from scipy.sparse import vstack
+            vectors = vstack([self.pending, vectors], format='csr')
+            self.pending = None
+        if not self.fitted and vectors.shape[0] < self.num_topics:
+            self.pending = vectors
+            return
+
+        for start in range(0, vectors.shape[0], self.batch_size):
+            self.model.partial_fit(vectors[start:start + self.batch_size])
+        self.sizes += np.bincount(self.model.predict(vectors), minlength=self.num_topics)
+
+    def _label_features(self, token_lists):
+        """Remember a word for every hashed feature that doesn't have one yet"""
+        words = pd.unique(np.array([token for tokens in token_lists for token in tokens], dtype=object))
+        features = self.vectorizer.transform([[word] for word in words]).indices
+        unlabeled = pd.isna(self.feature_words[features])
+        self.feature_words[features[unlabeled]] = words[unlabeled]
+
+    def predict(self, token_lists):
+        """Topic of each tokenized tweet, -1 for empty tweets or before any fitting"""
+        token_lists = list(token_lists)
+        labels = np.full(len(token_lists), -1, dtype=np.int64)
+        rows = [i for i, tokens in enumerate(token_lists) if tokens]
+        if self.fitted and rows:
+            labels[rows] = self.model.predict(self.vectorizer.transform([token_lists[i] for i in rows]))
+        return labels
+
+    def summary(self, top_terms=10, sizes=None):
+        """
+        Size, top terms and a short label for every topic, largest first. Sizes default to
+        every tweet the model was fitted on; pass per-topic counts to size other tweets.
+        """
+        if not self.fitted:
+            return []
+        if sizes is None:
+            sizes = self.sizes
+
+        topics = []
+        for topic in np.argsort(-sizes, kind='stable'):
+            centroid = self.model.cluster_centers_[topic]
+            features = np.argsort(-centroid, kind='stable')[:top_terms]
+            terms = [self.feature_words[feature] for feature in features if centroid[feature] > 0]
+            topics.append({
+                "topic": int(topic),
+                "label": " / ".join(terms[:3]),
+                "size": int(sizes[topic]),
+                "top_terms": terms
+            })
+        return topics
+
+class TopicModelCache:
+    """
+    Fitted topic models on disk, one file per source and corpus fingerprint. An unchanged
+    corpus loads its model as is; a corpus that has changed warm-starts from the newest
+    model of the same source that was fitted on enough of its tweets.
+    """
+
+    def __init__(self, cache_dir, max_entries=4, min_overlap=0.5):
+        self.cache_dir = cache_dir
+
+        # Models kept per source; older fingerprints are removed as new ones are saved
+        self.max_entries = max_entries
+
+        # Share of a changed corpus a model must have seen before it is warm-started
+        self.min_overlap = min_overlap
+
+    @staticmethod
+    def version():
+        """Cache format version together with the scikit-learn version the models pickle with"""
+        import sklearn
+        return (MODEL_CACHE_VERSION, sklearn.__version__)
+
+    @staticmethod
+    def fingerprint(keys):
+        """Order-independent fingerprint of a corpus from its 64-bit tweet keys"""
+        return hashlib.blake2b(np.unique(keys).tobytes(), digest_size=8).hexdigest()
+
+    def _entries(self, source):
+        """Cached model files of a source, newest first"""
+        try:
+            names = [name for name in os.listdir(self.cache_dir)
+                     if name.startswith(source + '-') and name.endswith('.pkl')]
+        except OSError:
+            return []
+        # Another process may remove files between listing and sorting them
+        def modified(path):
+            try:
+                return os.path.getmtime(path)
+            except OSError:
+                return 0.0
+
+        paths = [os.path.join(self.cache_dir, name) for name in names]
+        return sorted(paths, key=modified, reverse=True)
+
+    def load(self, source, keys):
+        """
+        The cached clusterer for the corpus, or the newest one of the source fitted on at
+        least min_overlap of its tweets, with the keys of the tweets it was fitted on;
+        (None, no keys) when nothing usable is cached
+        """
+        exact = os.path.join(self.cache_dir, f"{source}-{self.fingerprint(keys)}.pkl")
+        for path in [exact] + self._entries(source):
+            # Unreadable, half-removed or incompatible entries are skipped, never raised
+            try:
+                with open(path, 'rb') as file:
+                    entry = pickle.load(file)
+                if entry.get('version') != self.version():
+                    continue
+                if path == exact or np.isin(keys, entry['seen']).mean() >= self.min_overlap:
+                    return entry['clusterer'], entry['seen']
+            except Exception:
+                continue
+        return None, np.empty(0, dtype=np.uint64)
+
+    def save(self, source, keys, seen, clusterer):
+        """Store a clusterer under the corpus fingerprint, replacing any file atomically"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, f"{source}-{self.fingerprint(keys)}.pkl")
+
+        # Each writer gets its own temporary file, so concurrent saves never share one
+        with tempfile.NamedTemporaryFile(dir=self.cache_dir, prefix=os.path.basename(path) + '.',
+                                         suffix='.tmp', delete=False) as file:
+            try:
+                pickle.dump({'version': self.version(), 'seen': seen, 'clusterer': clusterer}, file,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            except BaseException:
+                file.close()
+                os.remove(file.name)
+                raise
+        os.replace(file.name, path)
+
+        for stale in self._entries(source)[self.max_entries:]:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
@@ -0,0 +1,290 @@
+# aiagent/trends.py
+import math
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import chain
+import numpy as np
+import pandas as pd
+
+# Sliding windows as {name: (window length, bucket width)} in seconds
+DEFAULT_WINDOWS = {
+    '1h': (3600, 300),
+    '24h': (86400, 3600),
+    '7d': (604800, 21600)
+}
+
+class WindowCounter:
+    """Word counts over a sliding time window, kept in a ring buffer of fixed-width buckets"""
+
+    def __init__(self, window_seconds, bucket_seconds):
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = max(1, window_seconds // bucket_seconds)
+        self.buckets = [Counter() for _ in range(self.num_buckets)]
+        self.totals = Counter()
+
+        # Absolute index (timestamp // bucket_seconds) of the newest bucket
+        self.newest = None
+
+    def add(self, timestamp, tokens):
+        """Count tokens from a tweet; tweets older than the window are ignored"""
+        bucket = int(timestamp // self.bucket_seconds)
+        if self.newest is None or bucket > self.newest:
+            self._advance(bucket)
+        elif bucket <= self.newest - self.num_buckets:
+            return
+
+        self.buckets[bucket % self.num_buckets].update(tokens)
+        self.totals.update(tokens)
+
+    def _advance(self, bucket):
+        """Move the window forward, expiring the buckets that fall out of it"""
+        if self.newest is not None:
+            for expired in range(self.newest + 1, min(bucket, self.newest + self.num_buckets) + 1):
+                slot = self.buckets[expired % self.num_buckets]
+                for word, count in slot.items():
+                    remaining = self.totals[word] - count
+                    if remaining > 0:
+                        self.totals[word] = remaining
+                    else:
+                        del self.totals[word]
+                slot.clear()
+
+        self.newest = bucket
+
+    def recent(self, count):
+        """The newest `count` buckets, oldest first; buckets beyond the window are empty"""
+        if self.newest is None:
+            return [Counter() for _ in range(count)]
+        return [self.buckets[(self.newest - back) % self.num_buckets] if back < self.num_buckets else Counter()
+                for back in reversed(range(count))]
+
+class DecayedCounter:
+    """Exponentially decayed word scores, updated in O(1) per token with forward decay"""
+
+    def __init__(self, half_life_seconds):
+        self.decay_rate = math.log(2) / half_life_seconds
+        self.scores = {}
+
+        # Scores are stored relative to this time so adding never touches other words
+        self.landmark = None
+
+    def add(self, timestamp, tokens):
+        """Add one mention per token at the given time"""
+        if self.landmark is None:
+            self.landmark = timestamp
+
+        exponent = self.decay_rate * (timestamp - self.landmark)
+        if exponent > 500:
+            self._move_landmark(timestamp)
+            exponent = 0.0
+
+        weight = math.exp(exponent)
+        scores = self.scores
+        for token in tokens:
+            scores[token] = scores.get(token, 0.0) + weight
+
+    def _move_landmark(self, timestamp):
+        """Rescale every score to a later landmark before the weights overflow"""
+        factor = math.exp(-self.decay_rate * (timestamp - self.landmark))
+        self.scores = {word: score * factor for word, score in self.scores.items()}
+        self.landmark = timestamp
+
+    def scores_at(self, timestamp):
+        """Decayed score of every word as of the given time"""
+        if self.landmark is None:
+            return {}
+        factor = math.exp(-self.decay_rate * (timestamp - self.landmark))
+        return {word: score * factor for word, score in self.scores.items()}
+
+class TrendEngine:
+    """
+    Sliding-window counts, exponentially decayed scores and per-word velocity and
+    acceleration for a stream of timestamped tweets
+    """
+
+    def __init__(self, windows=DEFAULT_WINDOWS, half_life_seconds=6 * 3600, velocity_window='24h'):
+        if velocity_window not in windows:
+            raise ValueError(f"Unknown velocity window '{velocity_window}', expected one of {sorted(windows)}")
+
+        self.windows = {name: WindowCounter(*spec) for name, spec in windows.items()}
+        self.decayed = DecayedCounter(half_life_seconds)
+        self.velocity_window = velocity_window
+
+        # Time of the newest tweet seen; windows and decay are measured from here
+        self.latest = None
+
+    def add(self, timestamp, tokens):
+        """Fold one tweet, given its epoch-second timestamp, into every counter"""
+        for window in self.windows.values():
+            window.add(timestamp, tokens)
+        self.decayed.add(timestamp, tokens)
+
+        if self.latest is None or timestamp > self.latest:
+            self.latest = timestamp
+
+    def velocities(self):
+        """
+        Per-word velocity (change in mentions between the last two buckets of the
+        velocity window) and acceleration (change in that velocity)
+        """
+        before, previous, newest = self.windows[self.velocity_window].recent(3)
+        velocities = {}
+        for word in set(before) | set(previous) | set(newest):
+            velocity = newest[word] - previous[word]
+            velocities[word] = (velocity, velocity - (previous[word] - before[word]))
+        return velocities
+
+    def snapshot(self, top_n=20):
+        """Top words per window, by decayed score and by velocity"""
+        if self.latest is None:
+            return {"as_of": None, "windows": {name: [] for name in self.windows},
+                    "decayed_scores": [], "velocity": []}
+
+        decayed = self.decayed.scores_at(self.latest)
+        top_decayed = sorted(decayed.items(), key=lambda x: x[1], reverse=True)[:top_n]
+
+        velocities = self.velocities()
+        top_velocity = sorted(velocities.items(), key=lambda x: x[1], reverse=True)[:top_n]
+
+        return {
+            "as_of": datetime.fromtimestamp(self.latest, timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+            "windows": {name: window.totals.most_common(top_n) for name, window in self.windows.items()},
+            "decayed_scores": [(word, round(score, 4)) for word, score in top_decayed],
+            "velocity": [{"word": word, "velocity": velocity, "acceleration": acceleration}
+                         for word, (velocity, acceleration) in top_velocity]
+        }
+
+class BurstDetector:
+    """
+    Flags words whose mentions in one time bucket jump well above that word's own
+    baseline, using a z-score computed over sparse (word, bucket) counts
+    """
+
+    def __init__(self, bucket_seconds=3600, threshold=3.0, min_count=3):
+        self.bucket_seconds = bucket_seconds
+        self.threshold = threshold
+        self.min_count = min_count
+
+        # Sparse time series: one entry per (word, bucket) with at least one mention
+        self.words = np.empty(0, dtype=object)
+        self.buckets = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+
+    def update(self, token_lists, timestamps):
+        """Add a batch of tokenized tweets with their epoch-second timestamps"""
+        token_lists = list(token_lists)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+
+        # Tweets without a usable date carry no time signal
+        dated = ~np.isnan(timestamps)
+        words = np.array(list(chain.from_iterable(token_lists)), dtype=object)[np.repeat(dated, lengths)]
+        buckets = np.repeat(np.floor(timestamps[dated] / self.bucket_seconds).astype(np.int64), lengths[dated])
+
+        pairs = pd.DataFrame({
+            'word': np.concatenate([self.words, words]),
+            'bucket': np.concatenate([self.buckets, buckets]),
+            'count': np.concatenate([self.counts, np.ones(len(words), dtype=np.int64)])
+        }).groupby(['word', 'bucket'], sort=False)['count'].sum()
+
+        self.words = pairs.index.get_level_values('word').to_numpy(dtype=object)
+        self.buckets = pairs.index.get_level_values('bucket').to_numpy(dtype=np.int64)
+        self.counts = pairs.to_numpy(dtype=np.int64)
+
+    def detect(self, top_n=20):
+        """Strongest burst of each flagged word, highest z-score first"""
+        if len(self.counts) == 0:
+            return []
+
+        num_buckets = int(self.buckets.max() - self.buckets.min()) + 1
+        if num_buckets < 2:
+            return []
+
+        word_ids, _ = pd.factorize(self.words)
+        counts = self.counts.astype(np.float64)
+        totals = np.bincount(word_ids, weights=counts)[word_ids]
+        squares = np.bincount(word_ids, weights=counts * counts)[word_ids]
+
+        # Each bucket is compared with the word's mean and spread over every other bucket.
+        # The spread is floored at one mention so rare words need a real jump to count.
+        others = num_buckets - 1
+        baseline = (totals - counts) / others
+        variance = np.maximum((squares - counts * counts) / others - baseline * baseline, 0.0)
+        z_scores = (counts - baseline) / np.maximum(np.sqrt(variance), 1.0)
+
+        flagged = np.flatnonzero((z_scores >= self.threshold) & (self.counts >= self.min_count))
+        if len(flagged) == 0:
+            return []
+
+        # Keep the strongest burst per word, then the top N words
+        flagged = flagged[np.argsort(-z_scores[flagged], kind='stable')]
+        _, first = np.unique(word_ids[flagged], return_index=True)
+        strongest = flagged[np.sort(first)][:top_n]
+
+        return [{
+            "word": self.words[i],
+            "bucket_start": datetime.fromtimestamp(int(self.buckets[i]) * self.bucket_seconds,
+                                                   timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+            "count": int(self.counts[i]),
+            "baseline": round(float(baseline[i]), 4),
+            "z_score": round(float(z_scores[i]), 4)
+        } for i in strongest]
+
+# Calendar periods the report can group by, as pandas period frequencies
+PERIOD_FREQUENCIES = {'day': 'D', 'week': 'W', 'month': 'M', 'year': 'Y'}
+
+class PeriodCounter:
+    """
+    Word counts per calendar period (day, week, month or year), kept as sparse
+    (period, word) counts so years of history never need a scan per period
+    """
+
+    def __init__(self, granularity='month'):
+        if granularity not in PERIOD_FREQUENCIES:
+            raise ValueError(f"Unknown granularity '{granularity}', expected one of {sorted(PERIOD_FREQUENCIES)}")
+        self.granularity = granularity
+
+        self.periods = np.empty(0, dtype=object)
+        self.words = np.empty(0, dtype=object)
+        self.counts = np.empty(0, dtype=np.int64)
+
+    def periods_of(self, timestamps):
+        """Period label ('2024-03' for months) of each epoch-second timestamp; None when missing"""
+        dates = pd.to_datetime(pd.Series(timestamps, dtype=np.float64), unit='s')
+        codes, uniques = pd.factorize(dates.dt.to_period(PERIOD_FREQUENCIES[self.granularity]))
+        labels = np.array([str(period) for period in uniques] + [None], dtype=object)
+        return labels[codes]
+
+    def update(self, word_lists, timestamps):
+        """Add a batch of word lists with their epoch-second timestamps"""
+        word_lists = list(word_lists)
+        lengths = np.fromiter((len(words) for words in word_lists), dtype=np.int64, count=len(word_lists))
+        periods = np.repeat(self.periods_of(timestamps), lengths)
+        words = np.array(list(chain.from_iterable(word_lists)), dtype=object)
+
+        # Undated tweets can't be placed in a period
+        dated = ~pd.isna(periods)
+        pairs = pd.DataFrame({
+            'period': np.concatenate([self.periods, periods[dated]]),
+            'word': np.concatenate([self.words, words[dated]]),
+            'count': np.concatenate([self.counts, np.ones(int(dated.sum()), dtype=np.int64)])
+        }).groupby(['period', 'word'], sort=False)['count'].sum()
+
+        self.periods = pairs.index.get_level_values('period').to_numpy(dtype=object)
+        self.words = pairs.index.get_level_values('word').to_numpy(dtype=object)
+        self.counts = pairs.to_numpy(dtype=np.int64)
+
+    def top(self, top_n=10):
+        """Most common words of every period, oldest period first; ties go to the word seen first"""
+        ranked = pd.DataFrame({
+            'period': self.periods,
+            'word': self.words,
+            'count': self.counts,
+            'order': np.arange(len(self.counts))
+        }).sort_values(['period', 'count', 'order'], ascending=[True, False, True])
+        ranked = ranked[ranked.groupby('period', sort=False).cumcount() < top_n]
+
+        trends = {}
+        for period, word, count in zip(ranked['period'], ranked['word'], ranked['count'].tolist()):
+            trends.setdefault(period, []).append((word, count))
+        return trends